@@ -0,0 +1,67 @@
+"""
+Comparación de Dijkstra unidireccional vs. bidireccional
+
+Uso:
+    python benchmark.py [lado_malla] [consultas]
+
+Genera una malla vial sintética de lado x lado municipios con pesos
+aleatorios (semilla fija) y reporta, para ManualGraph y CompactGraph, el
+promedio de nodos fijados y el tiempo por consulta de cada variante.
+"""
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from graph_package import ManualGraph, ShortestPaths
+
+
+def build_grid(side: int, seed: int = 42) -> ManualGraph:
+    rng = random.Random(seed)
+    graph = ManualGraph()
+    for r in range(side):
+        for c in range(side):
+            if c + 1 < side:
+                graph.add_edge(f"{r}-{c}", f"{r}-{c + 1}", float(rng.randint(5, 30)))
+            if r + 1 < side:
+                graph.add_edge(f"{r}-{c}", f"{r + 1}-{c}", float(rng.randint(5, 30)))
+    return graph
+
+
+def run(routes: ShortestPaths, queries: List[Tuple[str, str]], bidirectional: bool):
+    query = routes.bidirectional_shortest_path if bidirectional else routes.shortest_path
+    settled = 0
+    distances = []
+    t0 = time.perf_counter()
+    for src, dst in queries:
+        distance, _ = query(src, dst)
+        settled += routes.last_settled
+        distances.append(distance)
+    elapsed = time.perf_counter() - t0
+    return settled / len(queries), elapsed / len(queries) * 1000, distances
+
+
+def main():
+    side = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    graph = build_grid(side)
+    nodes = graph.get_nodes()
+    rng = random.Random(7)
+    queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(count)]
+    print(f"Malla {side}x{side}: {len(graph)} nodos, {len(graph.get_edges())} aristas, {count} consultas")
+
+    for label, target in (("ManualGraph", graph), ("CompactGraph", graph.freeze())):
+        routes = ShortestPaths(target)
+        uni_settled, uni_ms, uni_dist = run(routes, queries, bidirectional=False)
+        bi_settled, bi_ms, bi_dist = run(routes, queries, bidirectional=True)
+        if any(abs(a - b) > 1e-9 for a, b in zip(uni_dist, bi_dist)):
+            raise AssertionError("Las variantes devolvieron distancias distintas")
+        print(f"\n{label}")
+        print(f"  Unidireccional: {uni_settled:10.1f} nodos fijados  {uni_ms:8.2f} ms/consulta")
+        print(f"  Bidireccional:  {bi_settled:10.1f} nodos fijados  {bi_ms:8.2f} ms/consulta")
+        print(f"  Reducción de nodos fijados: {uni_settled / max(bi_settled, 1):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
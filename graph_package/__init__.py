@@ -1,22 +1,56 @@
 from .graph import ManualGraph
-from .algorithms import GraphTraversal
-from .file_io import GraphFileIO
+from .compact import CompactGraph
+from .disk_graph import DiskGraph
+from .algorithms import GraphTraversal, ShortestPaths, TraversalStep
+from .file_io import GraphFileIO, GraphFileError
+from .tracing import Tracer, TraceEvent, RingBufferTracer, CounterTracer, FileTracer
+from .contraction import ContractionHierarchy
 from .graph_model import GraphModel, GraphCompatibilityWrapper
 from .config import DEFAULT_CSV, SAMPLE_EDGES
 
-try:
-    from .gui import GraphApp
-    GUI_AVAILABLE = True
-except ImportError as e:
-    GraphApp = None
-    GUI_AVAILABLE = False
-    print("Instale las dependencias: pip install matplotlib networkx")
+
+def __getattr__(name: str):
+    """La GUI (tkinter + matplotlib) y la exportación se importan al pedirlas
+    por primera vez; quien solo usa el grafo no paga ese tiempo de arranque."""
+    if name in ("GraphApp", "GUI_AVAILABLE"):
+        try:
+            from .gui import GraphApp
+            available = True
+        except ImportError:
+            GraphApp = None
+            available = False
+            print("Instale las dependencias: pip install matplotlib")
+        globals().update(GraphApp=GraphApp, GUI_AVAILABLE=available)
+        return globals()[name]
+    if name == "export_traversal":
+        from .export import export_traversal
+        globals()[name] = export_traversal
+        return export_traversal
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
     'ManualGraph',
+    'CompactGraph',
+    'DiskGraph',
     'GraphTraversal', 
+    'TraversalStep',
+    'ShortestPaths',
     'GraphFileIO',
+    'GraphFileError',
+    'Tracer',
+    'TraceEvent',
+    'RingBufferTracer',
+    'CounterTracer',
+    'FileTracer',
+    'ContractionHierarchy',
     'GraphModel',
     'GraphCompatibilityWrapper',
+    'export_traversal',
     'GraphApp',
     'DEFAULT_CSV',
     'SAMPLE_EDGES',
@@ -1,59 +1,203 @@
-from typing import List
+import heapq
+from collections import deque
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 from .graph import ManualGraph
+from .compact import CompactGraph
+from .tracing import ENQUEUE, FINISH, POP, VISIT, Tracer
+
+
+class TraversalStep(NamedTuple):
+    node: str
+    depth: int
+    parent: Optional[str]
 
 
 class GraphTraversal:
     
-    def __init__(self, graph: ManualGraph):
+    def __init__(self, graph: Union[ManualGraph, CompactGraph]):
         self.graph = graph
     
-    def bfs(self, start: str) -> List[str]:
-        if start not in self.graph.adjacency_list:
+    def bfs(self, start: str, tracer: Optional[Tracer] = None) -> List[str]:
+        return [step.node for step in self.iter_bfs(start, tracer=tracer)]
+    
+    def dfs(self, start: str, tracer: Optional[Tracer] = None) -> List[str]:
+        return [step.node for step in self.iter_dfs(start, tracer=tracer)]
+    
+    # ---------- Recorridos incrementales ----------
+    def iter_bfs(self, start: str, target: Optional[str] = None,
+                 max_depth: Optional[int] = None,
+                 max_nodes: Optional[int] = None,
+                 tracer: Optional[Tracer] = None) -> Iterator[TraversalStep]:
+        """Generador BFS: produce (nodo, profundidad, padre) en orden de visita.
+        
+        Se detiene al visitar ``target``, al producir ``max_nodes`` nodos o sin
+        expandir más allá de ``max_depth``.
+        """
+        if start not in self.graph:
+            raise ValueError(f"Nodo '{start}' no existe en el grafo")
+        return self._walk(start, True, target, max_depth, max_nodes, tracer)
+    
+    def iter_dfs(self, start: str, target: Optional[str] = None,
+                 max_depth: Optional[int] = None,
+                 max_nodes: Optional[int] = None,
+                 tracer: Optional[Tracer] = None) -> Iterator[TraversalStep]:
+        """Generador DFS con el mismo orden que ``dfs`` y los mismos criterios
+        de parada que ``iter_bfs``."""
+        if start not in self.graph:
             raise ValueError(f"Nodo '{start}' no existe en el grafo")
+        return self._walk(start, False, target, max_depth, max_nodes, tracer)
+    
+    def _walk(self, start, breadth_first, target, max_depth, max_nodes, tracer):
+        trace = tracer is not None
+        produced = 0
+        if max_nodes is not None and max_nodes <= 0:
+            if trace:
+                tracer.emit(FINISH, None, produced)
+            return
         
-        visited = []
-        queue = [start]
+        pending = deque([(start, 0, None)])
+        take = pending.popleft if breadth_first else pending.pop
         seen = {start}
+        if trace:
+            tracer.emit(ENQUEUE, start, None)
+        
+        try:
+            while pending:
+                current, depth, parent = take()
+                if trace:
+                    tracer.emit(POP, current, depth)
+                    tracer.emit(VISIT, current, depth)
+                yield TraversalStep(current, depth, parent)
+                produced += 1
+                if current == target or produced == max_nodes:
+                    return
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                neighbors = self.graph.sorted_neighbors(current)
+                if not breadth_first:
+                    neighbors = reversed(neighbors)
+                for neighbor in neighbors:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        pending.append((neighbor, depth + 1, current))
+                        if trace:
+                            tracer.emit(ENQUEUE, neighbor, current)
+        finally:
+            if trace:
+                tracer.emit(FINISH, None, produced)
+
+
+class ShortestPaths:
+    """Dijkstra con montículo binario (borrado perezoso) sobre los pesos en km.
+    
+    ``last_settled`` guarda cuántos nodos fijó la última consulta.
+    """
+    
+    def __init__(self, graph: Union[ManualGraph, CompactGraph]):
+        self.graph = graph
+        self.last_settled = 0
+    
+    def shortest_path(self, src: str, dst: str) -> Tuple[float, List[str]]:
+        """Distancia y ruta mínima de ``src`` a ``dst``; ``(inf, [])`` si no hay ruta"""
+        self._check(src)
+        self._check(dst)
+        dist, parent = self._run(src, dst)
+        if dst not in dist:
+            return float('inf'), []
+        return dist[dst], _build_path(parent, dst)
+    
+    def shortest_path_tree(self, src: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """Distancias y padres de todos los nodos alcanzables desde ``src``"""
+        self._check(src)
+        return self._run(src, None)
+    
+    def bidirectional_shortest_path(self, src: str, dst: str) -> Tuple[float, List[str]]:
+        """Igual que ``shortest_path`` pero con búsquedas simultáneas desde
+        ambos extremos; se detiene cuando la suma de los mínimos de ambas
+        fronteras alcanza la mejor ruta encontrada."""
+        self._check(src)
+        self._check(dst)
+        if src == dst:
+            self.last_settled = 1
+            return 0.0, [src]
         
+        graph = self.graph
+        inf = float('inf')
+        dist = ({}, {})
+        best = ({src: 0.0}, {dst: 0.0})
+        parent = ({src: None}, {dst: None})
+        heaps = ([(0.0, src)], [(0.0, dst)])
+        mu = inf
+        meet = None
+        settled = 0
         
-        while queue:
-            current = queue.pop(0)
-            visited.append(current)
-            neighbors = sorted(self.graph.get_neighbors(current))
-            for neighbor in neighbors:
-                if neighbor not in seen:
-                    seen.add(neighbor)
-                    queue.append(neighbor)
-                    print(f"[BFS DEBUG] Agregando a cola: {neighbor}")
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= mu:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, u = heapq.heappop(heaps[side])
+            if u in dist[side]:
+                continue
+            dist[side][u] = d
+            settled += 1
+            own_best, other_best = best[side], best[1 - side]
             
-            print(f"[BFS DEBUG] Cola actual: {queue}")
+            if u in other_best and d + other_best[u] < mu:
+                mu = d + other_best[u]
+                meet = (u, u)
+            for v, weight in graph.neighbor_items(u):
+                nd = d + weight
+                if v not in dist[side] and nd < own_best.get(v, inf):
+                    own_best[v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+                if v in other_best and nd + other_best[v] < mu:
+                    mu = nd + other_best[v]
+                    meet = (u, v) if side == 0 else (v, u)
         
-        print(f"[BFS DEBUG] Orden final: {visited}")
-        return visited
+        self.last_settled = settled
+        if meet is None:
+            return inf, []
+        forward = _build_path(parent[0], meet[0])
+        backward = _build_path(parent[1], meet[1])
+        if meet[0] == meet[1]:
+            backward.pop()
+        return mu, forward + backward[::-1]
     
-    def dfs(self, start: str) -> List[str]:
-        if start not in self.graph.adjacency_list:
-            raise ValueError(f"Nodo '{start}' no existe en el grafo")
-        
-        visited = []
-        stack = [start]
-        seen = {start}
+    def _run(self, src: str, dst: Optional[str]):
+        graph = self.graph
+        dist: Dict[str, float] = {}
+        best: Dict[str, float] = {src: 0.0}
+        parent: Dict[str, Optional[str]] = {src: None}
+        heap = [(0.0, src)]
         
-        print(f"[DFS DEBUG] Iniciando desde: {start}")
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in dist:
+                continue
+            dist[u] = d
+            if u == dst:
+                break
+            for v, weight in graph.neighbor_items(u):
+                if v in dist:
+                    continue
+                nd = d + weight
+                if nd < best.get(v, float('inf')):
+                    best[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
         
-        while stack:
-            current = stack.pop()
-            visited.append(current)
-            print(f"[DFS DEBUG] Visitando: {current}")
-            
-            neighbors = sorted(self.graph.get_neighbors(current), reverse=True)
-            for neighbor in neighbors:
-                if neighbor not in seen:
-                    seen.add(neighbor)
-                    stack.append(neighbor)
-                    print(f"[DFS DEBUG] Agregando a pila: {neighbor}")
-            
-            print(f"[DFS DEBUG] Pila actual: {stack}")
-        
-        print(f"[DFS DEBUG] Orden final: {visited}")
-        return visited
\ No newline at end of file
+        self.last_settled = len(dist)
+        return dist, {node: parent[node] for node in dist}
+    
+    def _check(self, node: str):
+        if node not in self.graph:
+            raise ValueError(f"Nodo '{node}' no existe en el grafo")
+
+
+def _build_path(parent: Dict[str, Optional[str]], dst: str) -> List[str]:
+    path = [dst]
+    while parent[path[-1]] is not None:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
@@ -0,0 +1,156 @@
+"""
+Línea de comandos sin GUI: cargar, consultar, modificar y guardar el grafo
+
+    python -m graph_package [-f archivo] <comando> [argumentos]
+    python main.py --nogui [-f archivo] <comando> [argumentos]
+
+Solo importa el núcleo del paquete (sin tkinter, matplotlib ni NumPy salvo
+que el comando los necesite), así que arranca rápido en procesos de corta vida.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from .config import DEFAULT_CSV, SAMPLE_EDGES
+from .contraction import hierarchy_path
+from .graph_model import GraphModel
+from .journal import MutationJournal
+
+EDIT_COMMANDS = ("add-node", "remove-node", "add-edge", "remove-edge")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="graph_package",
+                                     description="Grafo de municipios sin interfaz gráfica")
+    parser.add_argument("-f", "--file", default=DEFAULT_CSV,
+                        help=f"CSV o GraphML (también .gz / .xz); por defecto {DEFAULT_CSV}")
+    parser.add_argument("--strict", action="store_true", help="validar cada fila y fallar ante errores")
+    parser.add_argument("--no-snapshots", action="store_true", help="no usar ni escribir la instantánea .graphbin")
+    commands = parser.add_subparsers(dest="command", metavar="comando")
+
+    commands.add_parser("info", help="municipios, carreteras y componentes (por defecto)")
+    commands.add_parser("nodes", help="listar municipios")
+    commands.add_parser("components", help="componentes conexas, una por línea")
+    sub = commands.add_parser("neighbors", help="vecinos de un municipio y distancias")
+    sub.add_argument("node")
+    for name in ("bfs", "dfs"):
+        sub = commands.add_parser(name, help=f"orden de visita {name.upper()}")
+        sub.add_argument("start")
+    sub = commands.add_parser("path", help="ruta más corta")
+    sub.add_argument("src")
+    sub.add_argument("dst")
+    sub.add_argument("--ch", action="store_true", help="usar la jerarquía de contracción guardada (preprocess)")
+    commands.add_parser("preprocess", help="construir y guardar la jerarquía de contracción")
+
+    sub = commands.add_parser("add-node", help="agregar municipio")
+    sub.add_argument("node")
+    sub = commands.add_parser("remove-node", help="eliminar municipio")
+    sub.add_argument("node")
+    sub = commands.add_parser("add-edge", help="agregar o actualizar carretera")
+    sub.add_argument("u")
+    sub.add_argument("v")
+    sub.add_argument("weight", type=float)
+    sub = commands.add_parser("remove-edge", help="eliminar carretera")
+    sub.add_argument("u")
+    sub.add_argument("v")
+
+    sub = commands.add_parser("save", help="guardar en otro archivo (formato según la extensión)")
+    sub.add_argument("output")
+    sub = commands.add_parser("export", help="exportar la animación de un recorrido (GIF, MP4 o PNG)")
+    sub.add_argument("start")
+    sub.add_argument("output")
+    sub.add_argument("--algorithm", default="bfs", choices=("bfs", "dfs", "shortest_path"))
+    sub.add_argument("--target", help="destino para shortest_path")
+    sub.add_argument("--fps", type=float, default=1.0)
+    sub.add_argument("--workers", type=int)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    command = args.command or "info"
+    path = args.file
+    if not os.path.exists(path) and path != DEFAULT_CSV:
+        print(f"[ERROR] No existe el archivo: {path}", file=sys.stderr)
+        return 1
+
+    model = GraphModel(use_snapshots=not args.no_snapshots)
+    try:
+        model.load_from_csv(path, SAMPLE_EDGES if path == DEFAULT_CSV else None, strict=args.strict)
+        if command in EDIT_COMMANDS:
+            # Las modificaciones se registran en la bitácora del archivo
+            model.open_journal(path)
+            try:
+                _edit(model, command, args)
+                if not model.save():
+                    return 1
+            finally:
+                model.journal.close()
+            return 0
+        MutationJournal.replay(model.manual_graph, path)
+        return _query(model, command, args, path)
+    except (ValueError, RuntimeError, ImportError, OSError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+
+def _edit(model: GraphModel, command: str, args: argparse.Namespace):
+    graph = model.manual_graph
+    if command == "add-node":
+        graph.add_node(args.node)
+    elif command == "remove-node":
+        if args.node not in graph:
+            raise ValueError(f"Nodo '{args.node}' no existe en el grafo")
+        graph.remove_node(args.node)
+    elif command == "add-edge":
+        graph.add_edge(args.u, args.v, args.weight)
+    elif not graph.has_edge(args.u, args.v):
+        raise ValueError(f"La carretera '{args.u}' – '{args.v}' no existe")
+    else:
+        graph.remove_edge(args.u, args.v)
+
+
+def _query(model: GraphModel, command: str, args: argparse.Namespace, path: str) -> int:
+    graph = model.manual_graph
+    if command == "info":
+        print(f"Municipios: {len(graph)}")
+        print(f"Carreteras: {sum(1 for _ in graph.iter_edges())}")
+        print(f"Componentes: {graph.component_count()}")
+    elif command == "nodes":
+        _print_lines(sorted(graph.get_nodes()))
+    elif command == "components":
+        for component in model.components():
+            print(", ".join(sorted(component)))
+    elif command == "neighbors":
+        if args.node not in graph:
+            raise ValueError(f"Nodo '{args.node}' no existe en el grafo")
+        for neighbor, weight in sorted(graph.neighbor_items(args.node)):
+            print(f"{neighbor}\t{weight:g}")
+    elif command in ("bfs", "dfs"):
+        _print_lines(getattr(model, command)(args.start))
+    elif command == "path":
+        if args.ch and not model.load_hierarchy(path):
+            print("[AVISO] No hay jerarquía vigente; se usa Dijkstra", file=sys.stderr)
+        distance, route = model.shortest_path(args.src, args.dst)
+        if not route:
+            print(f"No existe ruta entre '{args.src}' y '{args.dst}'", file=sys.stderr)
+            return 1
+        print(f"{distance:g}")
+        _print_lines(route)
+    elif command == "preprocess":
+        model.preprocess_routes(path)
+        print(f"Jerarquía guardada en {hierarchy_path(path)}")
+    elif command == "save":
+        return 0 if model.save_to_csv(args.output) else 1
+    elif command == "export":
+        from .export import export_traversal
+
+        frames = export_traversal(model, args.start, args.output, algorithm=args.algorithm, target=args.target,
+                                  fps=args.fps, workers=args.workers)
+        print(f"{frames} cuadros escritos en {args.output}")
+    return 0
+
+
+def _print_lines(items: List[str]):
+    sys.stdout.write("".join(f"{item}\n" for item in items))
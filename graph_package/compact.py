@@ -0,0 +1,173 @@
+"""
+Instantánea compacta (CSR) e inmutable de un ManualGraph
+"""
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class CompactGraph:
+    """Grafo de solo lectura con nodos internados como enteros y listas de
+    adyacencia contiguas (offsets / vecinos / pesos).
+
+    Los vecinos de cada nodo se guardan ordenados por nombre, de modo que los
+    recorridos producen el mismo orden que sobre ManualGraph.
+    """
+
+    def __init__(self, names: List[str], offsets: Sequence[int],
+                 targets: Sequence[int], weights: Sequence[float]):
+        if len(offsets) != len(names) + 1:
+            raise ValueError("offsets debe tener len(names) + 1 elementos")
+        if len(targets) != len(weights):
+            raise ValueError("targets y weights deben tener la misma longitud")
+        self.names = names
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_manual(cls, graph) -> "CompactGraph":
+        names = graph.get_nodes()
+        index = {name: i for i, name in enumerate(names)}
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        for name in names:
+            row = graph.adjacency_list[name]
+            for neighbor in sorted(row):
+                targets.append(index[neighbor])
+                weights.append(row[neighbor])
+            offsets.append(len(targets))
+        return cls(names, offsets, targets, weights)
+
+    @classmethod
+    def from_columns(cls, names: List[str], src: Sequence[int], dst: Sequence[int],
+                     weights: Sequence[float]) -> "CompactGraph":
+        """Construir el CSR desde columnas de aristas; ante aristas repetidas
+        gana la última, igual que con ``ManualGraph.add_edge``."""
+        rows: List[Dict[int, float]] = [{} for _ in names]
+        for s, d, weight in zip(src, dst, weights):
+            rows[s][d] = weight
+            rows[d][s] = weight
+        
+        rank = [0] * len(names)
+        for position, i in enumerate(sorted(range(len(names)), key=names.__getitem__)):
+            rank[i] = position
+        by_name = rank.__getitem__
+        
+        offsets = array('q', [0])
+        targets = array('i')
+        weights_out = array('d')
+        for row in rows:
+            block = sorted(row, key=by_name)
+            targets.extend(block)
+            weights_out.extend(map(row.__getitem__, block))
+            offsets.append(len(targets))
+        return cls(list(names), offsets, targets, weights_out)
+
+    # ---------- Acceso por id ----------
+    def node_id(self, node: str) -> int:
+        try:
+            return self.index[node]
+        except KeyError:
+            raise ValueError(f"Nodo '{node}' no existe en el grafo") from None
+
+    def neighbor_ids(self, i: int) -> Sequence[int]:
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbor_weights(self, i: int) -> Sequence[float]:
+        return self.weights[self.offsets[i]:self.offsets[i + 1]]
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    # ---------- Interfaz compatible con ManualGraph ----------
+    def has_edge(self, u: str, v: str) -> bool:
+        return self._edge_slot(u, v) is not None
+
+    def get_weight(self, u: str, v: str) -> float:
+        slot = self._edge_slot(u, v)
+        if slot is None:
+            return float('inf')
+        return self.weights[slot]
+
+    def get_neighbors(self, node: str) -> List[str]:
+        i = self.index.get(node)
+        if i is None:
+            return []
+        names = self.names
+        return [names[j] for j in self.neighbor_ids(i)]
+
+    def sorted_neighbors(self, node: str) -> List[str]:
+        """Los bloques CSR ya están ordenados por nombre"""
+        return self.get_neighbors(node)
+
+    def neighbor_items(self, node: str) -> Iterator[Tuple[str, float]]:
+        """Pares (vecino, peso) del nodo"""
+        i = self.index.get(node)
+        if i is None:
+            return iter(())
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return zip(map(self.names.__getitem__, self.targets[start:end]), self.weights[start:end])
+
+    def get_nodes(self) -> List[str]:
+        return list(self.names)
+
+    def get_edges(self) -> List[Tuple[str, str, float]]:
+        edges = []
+        names = self.names
+        for i in range(len(names)):
+            for k in range(self.offsets[i], self.offsets[i + 1]):
+                j = self.targets[k]
+                if i < j:
+                    edges.append((names[i], names[j], self.weights[k]))
+        return edges
+
+    def edge_count(self) -> int:
+        """Aristas no dirigidas: cada una ocupa dos entradas CSR salvo los lazos"""
+        loops = 0
+        for i in range(len(self.names)):
+            for k in range(self.offsets[i], self.offsets[i + 1]):
+                loops += self.targets[k] == i
+        return (len(self.targets) - loops) // 2 + loops
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def to_manual(self):
+        """Reconstruir un ManualGraph editable"""
+        from .graph import ManualGraph
+        graph = ManualGraph()
+        graph.load_compact(self)
+        return graph
+
+    def as_numpy(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Vistas NumPy (sin copia) de offsets, vecinos y pesos"""
+        # NumPy se importa recién aquí: es opcional y domina el arranque del paquete
+        try:
+            import numpy as np
+        except ModuleNotFoundError:
+            raise ImportError("NumPy es requerido para as_numpy()") from None
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.targets, dtype=np.int32),
+                np.frombuffer(self.weights, dtype=np.float64))
+
+    def _edge_slot(self, u: str, v: str) -> Optional[int]:
+        i = self.index.get(u)
+        if i is None or v not in self.index:
+            return None
+        # Los bloques están ordenados por nombre: búsqueda binaria
+        names, targets = self.names, self.targets
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if names[targets[mid]] < v:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.offsets[i + 1] and names[targets[lo]] == v:
+            return lo
+        return None
@@ -2,6 +2,27 @@
 from typing import List, Tuple
 
 DEFAULT_CSV = "edges.csv"
+HIERARCHY_SUFFIX = ".ch.json"
+SNAPSHOT_SUFFIX = ".graphbin"
+JOURNAL_SUFFIX = ".journal"
+# Mínimo de operaciones en bitácora antes de compactar al guardar
+JOURNAL_COMPACT_MIN_OPS = 1000
+# Grafo en disco: páginas leídas bajo demanda y aristas por tramo del ordenamiento externo
+DISK_PAGE_SIZE = 64 * 1024
+DISK_CACHE_PAGES = 256
+DISK_SORT_CHUNK = 1_000_000
+# Distribuciones de nodos guardadas (una por conjunto de nodos)
+LAYOUT_CACHE_DIR = ".layouts"
+LAYOUT_CACHE_MAX_FILES = 32
+# Iteraciones de la distribución dirigida por fuerzas
+LAYOUT_ITERATIONS = 50
+# Nivel de detalle del dibujo según lo que se ve: pesos de arista y nombres
+# solo con pocas aristas/nodos a la vista; con muchos nodos se agrupan en una
+# cuadrícula de AGGREGATE_GRID x AGGREGATE_GRID celdas
+EDGE_LABEL_MAX_EDGES = 200
+NODE_LABEL_MAX_NODES = 300
+AGGREGATE_MIN_NODES = 3000
+AGGREGATE_GRID = 64
 
 SAMPLE_EDGES: List[Tuple[str, str, float]] = [
     ("Guatemala City", "Mixco", 11),
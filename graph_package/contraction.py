@@ -0,0 +1,255 @@
+"""
+Jerarquía de contracción (CH) para consultas repetidas de rutas mínimas
+"""
+import hashlib
+import heapq
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .algorithms import ShortestPaths
+from .config import HIERARCHY_SUFFIX
+from .graph import ManualGraph
+
+FORMAT_VERSION = 1
+# Límite de nodos fijados por búsqueda de testigos durante la contracción
+WITNESS_SETTLE_LIMIT = 64
+
+
+def hierarchy_path(csv_path: str) -> str:
+    return csv_path + HIERARCHY_SUFFIX
+
+
+def graph_fingerprint(graph: ManualGraph) -> str:
+    """Huella del contenido del grafo (nodos, aristas y pesos)"""
+    digest = hashlib.sha256()
+    for node in sorted(graph.get_nodes()):
+        digest.update(node.encode('utf-8'))
+        digest.update(b'\0')
+    for u, v, weight in sorted((min(u, v), max(u, v), w) for u, v, w in graph.get_edges()):
+        digest.update(f"{u}\0{v}\0{weight!r}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ContractionHierarchy:
+    """Jerarquía asociada a un grafo. Si el grafo cambió desde el
+    preprocesamiento, las consultas usan Dijkstra sobre el grafo actual."""
+
+    def __init__(self, graph: ManualGraph, names: List[str], rank: List[int],
+                 up: List[List[Tuple[int, float, int]]], fingerprint: str):
+        self.graph = graph
+        self.names = names
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.rank = rank
+        self.up = up
+        self.fingerprint = fingerprint
+        self.middle: Dict[Tuple[int, int], int] = {}
+        for u, edges in enumerate(up):
+            for v, _, mid in edges:
+                if mid >= 0:
+                    self.middle[(u, v) if u < v else (v, u)] = mid
+        self.last_settled = 0
+        self._checked_version: Optional[int] = None
+        self._current = False
+        self._fallback = ShortestPaths(graph)
+
+    # ---------- Preprocesamiento ----------
+    @classmethod
+    def build(cls, graph: ManualGraph) -> "ContractionHierarchy":
+        names = graph.get_nodes()
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        adj: List[Dict[int, float]] = [{} for _ in range(n)]
+        for u, v, weight in graph.get_edges():
+            a, b = index[u], index[v]
+            if a == b:
+                continue
+            if weight < adj[a].get(b, float('inf')):
+                adj[a][b] = weight
+                adj[b][a] = weight
+
+        middle: Dict[Tuple[int, int], int] = {}
+        deleted = [0] * n
+        rank = [-1] * n
+        up: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+
+        def priority(v: int, shortcuts: List[Tuple[int, int, float]]) -> int:
+            # Diferencia de aristas + vecinos ya contraídos (reparte la contracción)
+            return len(shortcuts) - len(adj[v]) + deleted[v]
+
+        heap = [(priority(v, _shortcuts(adj, v)), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            if rank[v] >= 0:
+                continue
+            # Actualización perezosa: recalcular y reinsertar si ya no es el mínimo
+            shortcuts = _shortcuts(adj, v)
+            current = priority(v, shortcuts)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for a, b, d in shortcuts:
+                if d < adj[a].get(b, float('inf')):
+                    adj[a][b] = d
+                    adj[b][a] = d
+                    middle[(a, b) if a < b else (b, a)] = v
+            rank[v] = order
+            order += 1
+            for nb, weight in adj[v].items():
+                up[v].append((nb, weight, middle.get((v, nb) if v < nb else (nb, v), -1)))
+                del adj[nb][v]
+                deleted[nb] += 1
+            adj[v] = {}
+
+        hierarchy = cls(graph, names, rank, up, graph_fingerprint(graph))
+        hierarchy._checked_version = graph.version
+        hierarchy._current = True
+        return hierarchy
+
+    # ---------- Persistencia ----------
+    def save(self, path: str) -> bool:
+        data = {
+            "format": FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "names": self.names,
+            "rank": self.rank,
+            "up": self.up,
+        }
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            print(f"Error guardando jerarquía: {e}")
+            return False
+
+    @classmethod
+    def load(cls, path: str, graph: ManualGraph) -> Optional["ContractionHierarchy"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("format") != FORMAT_VERSION:
+                return None
+            up = [[(v, w, m) for v, w, m in edges] for edges in data["up"]]
+            return cls(graph, data["names"], data["rank"], up, data["fingerprint"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error cargando jerarquía: {e}")
+            return None
+
+    # ---------- Consultas ----------
+    def is_current(self) -> bool:
+        """True si el grafo no cambió desde el preprocesamiento"""
+        if self._checked_version != self.graph.version:
+            self._current = graph_fingerprint(self.graph) == self.fingerprint
+            self._checked_version = self.graph.version
+        return self._current
+
+    def shortest_path(self, src: str, dst: str) -> Tuple[float, List[str]]:
+        if not self.is_current():
+            result = self._fallback.shortest_path(src, dst)
+            self.last_settled = self._fallback.last_settled
+            return result
+        for node in (src, dst):
+            if node not in self.index:
+                raise ValueError(f"Nodo '{node}' no existe en el grafo")
+
+        s, t = self.index[src], self.index[dst]
+        inf = float('inf')
+        dist: Tuple[Dict[int, float], Dict[int, float]] = ({}, {})
+        best: Tuple[Dict[int, float], Dict[int, float]] = ({s: 0.0}, {t: 0.0})
+        parent: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        mu, meet = inf, -1
+        settled = 0
+
+        # Búsqueda bidireccional solo hacia nodos de mayor rango
+        while True:
+            live = [side for side in (0, 1) if heaps[side] and heaps[side][0][0] < mu]
+            if not live:
+                break
+            side = min(live, key=lambda k: heaps[k][0][0])
+            d, u = heapq.heappop(heaps[side])
+            if u in dist[side]:
+                continue
+            dist[side][u] = d
+            settled += 1
+            if u in dist[1 - side] and d + dist[1 - side][u] < mu:
+                mu, meet = d + dist[1 - side][u], u
+            for v, weight, _ in self.up[u]:
+                nd = d + weight
+                if v not in dist[side] and nd < best[side].get(v, inf):
+                    best[side][v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+
+        self.last_settled = settled
+        if meet < 0:
+            return inf, []
+        forward = _chain(parent[0], meet)
+        backward = _chain(parent[1], meet)
+        forward.reverse()
+        ids = forward + backward[1:]
+        return mu, [self.names[i] for i in self._unpack(ids)]
+
+    def _unpack(self, ids: List[int]) -> List[int]:
+        path = [ids[0]]
+        for a, b in zip(ids, ids[1:]):
+            stack = [(a, b)]
+            while stack:
+                x, y = stack.pop()
+                mid = self.middle.get((x, y) if x < y else (y, x))
+                if mid is None:
+                    path.append(y)
+                else:
+                    stack.append((mid, y))
+                    stack.append((x, mid))
+        return path
+
+
+def _shortcuts(adj: List[Dict[int, float]], v: int) -> List[Tuple[int, int, float]]:
+    """Atajos necesarios al contraer ``v`` (sin ruta testigo más corta)"""
+    neighbors = list(adj[v].items())
+    shortcuts = []
+    for i, (a, wa) in enumerate(neighbors):
+        targets = {b: wa + wb for b, wb in neighbors[i + 1:]}
+        if not targets:
+            continue
+        witness = _witness_search(adj, a, v, max(targets.values()))
+        for b, via in targets.items():
+            if witness.get(b, float('inf')) > via:
+                shortcuts.append((a, b, via))
+    return shortcuts
+
+
+def _witness_search(adj: List[Dict[int, float]], src: int, avoid: int, limit: float) -> Dict[int, float]:
+    dist: Dict[int, float] = {}
+    best: Dict[int, float] = {src: 0.0}
+    heap = [(0.0, src)]
+    while heap and len(dist) < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(heap)
+        if u in dist:
+            continue
+        dist[u] = d
+        for v, weight in adj[u].items():
+            nd = d + weight
+            if v != avoid and nd <= limit and nd < best.get(v, float('inf')):
+                best[v] = nd
+                heapq.heappush(heap, (nd, v))
+    # Las distancias tentativas también son rutas testigo válidas
+    best.update(dist)
+    return best
+
+
+def _chain(parent: Dict[int, int], node: int) -> List[int]:
+    chain = [node]
+    while parent[chain[-1]] >= 0:
+        chain.append(parent[chain[-1]])
+    return chain
+
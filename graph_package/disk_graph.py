@@ -0,0 +1,306 @@
+"""
+Grafo en disco para redes que no caben en memoria como diccionarios
+
+Usa el mismo formato .graphbin de snapshot.py (aristas ordenadas por nodo +
+índice de offsets), pero en lugar de mapear todo el archivo lee los bloques de
+vecinos bajo demanda a través de una caché LRU de páginas acotada.
+"""
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import DISK_CACHE_PAGES, DISK_PAGE_SIZE, DISK_SORT_CHUNK
+from .file_io import GraphFileIO
+from .snapshot import HEADER, MAGIC, _BYTEORDER, source_signature
+
+# Registro intermedio del ordenamiento externo: origen, rango del destino, secuencia, destino, peso
+_RUN_RECORD = struct.Struct("=iiqid")
+_RAW_EDGE = struct.Struct("=iid")
+_IO_BUFFER = 1 << 20
+
+
+class PageCache:
+    """Caché LRU de páginas de tamaño fijo sobre un archivo binario"""
+
+    def __init__(self, path: str, page_size: int = DISK_PAGE_SIZE, max_pages: int = DISK_CACHE_PAGES):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.hits = 0
+        self.misses = 0
+        self._file = open(path, 'rb')
+        self._pages: "OrderedDict[int, bytes]" = OrderedDict()
+
+    def read(self, offset: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        size = self.page_size
+        first, last = offset // size, (offset + length - 1) // size
+        chunks = [self._page(page) for page in range(first, last + 1)]
+        start = offset - first * size
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        return data[start:start + length]
+
+    def _page(self, page: int) -> bytes:
+        data = self._pages.get(page)
+        if data is not None:
+            self.hits += 1
+            self._pages.move_to_end(page)
+            return data
+        self.misses += 1
+        self._file.seek(page * self.page_size)
+        data = self._file.read(self.page_size)
+        self._pages[page] = data
+        if len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "pages": len(self._pages), "max_pages": self.max_pages}
+
+    def close(self):
+        self._pages.clear()
+        self._file.close()
+
+
+class DiskGraph:
+    """Misma interfaz de lectura que ManualGraph (``get_neighbors``,
+    ``get_weight``, ``has_edge``, ``get_nodes``...) con las aristas en disco.
+
+    En memoria solo quedan los nombres y el índice de offsets; los vecinos se
+    leen por páginas, así que GraphTraversal y ShortestPaths funcionan sobre
+    grafos mayores que la RAM.
+    """
+
+    def __init__(self, path: str, page_size: int = DISK_PAGE_SIZE, max_pages: int = DISK_CACHE_PAGES):
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Archivo de grafo inválido: {path}")
+            magic, byteorder, _, _, _, n, m, edges, names_len = HEADER.unpack(header)
+            if magic != MAGIC or byteorder != _BYTEORDER:
+                raise ValueError(f"Archivo de grafo inválido: {path}")
+            names_blob = file.read(names_len)
+            self.names: List[str] = names_blob.decode('utf-8').split("\0") if n else []
+            pos = _align(HEADER.size + names_len)
+            file.seek(pos)
+            self.offsets = array('q')
+            self.offsets.frombytes(file.read((n + 1) * 8))
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self._itemsize = array('i').itemsize
+        self._targets_pos = _align(pos + (n + 1) * 8)
+        self._weights_pos = _align(self._targets_pos + m * self._itemsize)
+        self._entries = m
+        self._edges = edges
+        self.path = path
+        self.pages = PageCache(path, page_size, max_pages)
+
+    # ---------- Construcción ----------
+    @classmethod
+    def build(cls, source: str, path: str, chunk_size: int = DISK_SORT_CHUNK) -> "DiskGraph":
+        """Convertir un archivo de aristas (CSV/GraphML) en un grafo en disco.
+
+        Lee el archivo en streaming, ordena las aristas por nodo en tramos de
+        ``chunk_size`` y los combina (ordenamiento externo), de modo que la
+        memoria usada es la de los nombres más un tramo. Ante aristas
+        repetidas gana la última, igual que con ``ManualGraph.add_edge``.
+        """
+        workdir = tempfile.mkdtemp(prefix="diskgraph-", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            names, raw_path = _intern_edges(source, workdir)
+            rank = [0] * len(names)
+            for position, i in enumerate(sorted(range(len(names)), key=names.__getitem__)):
+                rank[i] = position
+            runs = _sorted_runs(raw_path, rank, workdir, chunk_size)
+            _merge_runs(runs, names, source, path, workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        return cls(path)
+
+    # ---------- Acceso por id ----------
+    def neighbor_ids(self, i: int) -> array:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        block = array('i')
+        block.frombytes(self.pages.read(self._targets_pos + start * self._itemsize, (end - start) * self._itemsize))
+        return block
+
+    def neighbor_weights(self, i: int) -> array:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        block = array('d')
+        block.frombytes(self.pages.read(self._weights_pos + start * 8, (end - start) * 8))
+        return block
+
+    # ---------- Interfaz compatible con ManualGraph ----------
+    def has_edge(self, u: str, v: str) -> bool:
+        return self.get_weight(u, v) != float('inf')
+
+    def get_weight(self, u: str, v: str) -> float:
+        """Búsqueda binaria en el bloque de ``u``, que está ordenado por nombre
+        (no por id); solo se lee el peso encontrado"""
+        i, j = self.index.get(u), self.index.get(v)
+        if i is None or j is None:
+            return float('inf')
+        block, names = self.neighbor_ids(i), self.names
+        lo, hi = 0, len(block)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if names[block[mid]] < v:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(block) or block[lo] != j:
+            return float('inf')
+        weight = array('d')
+        weight.frombytes(self.pages.read(self._weights_pos + (self.offsets[i] + lo) * 8, 8))
+        return weight[0]
+
+    def get_neighbors(self, node: str) -> List[str]:
+        i = self.index.get(node)
+        if i is None:
+            return []
+        return list(map(self.names.__getitem__, self.neighbor_ids(i)))
+
+    def sorted_neighbors(self, node: str) -> List[str]:
+        """Los bloques en disco ya están ordenados por nombre"""
+        return self.get_neighbors(node)
+
+    def neighbor_items(self, node: str) -> Iterator[Tuple[str, float]]:
+        i = self.index.get(node)
+        if i is None:
+            return iter(())
+        return zip(map(self.names.__getitem__, self.neighbor_ids(i)), self.neighbor_weights(i))
+
+    def get_nodes(self) -> List[str]:
+        return list(self.names)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, float]]:
+        names = self.names
+        for i in range(len(names)):
+            for j, weight in zip(self.neighbor_ids(i), self.neighbor_weights(i)):
+                if i <= j:
+                    yield names[i], names[j], weight
+
+    def edge_count(self) -> int:
+        """Aristas no dirigidas: cada una ocupa dos entradas CSR salvo los lazos"""
+        return self._edges
+
+    def close(self):
+        self.pages.close()
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _align(pos: int) -> int:
+    return (pos + 7) & ~7
+
+
+def _intern_edges(source: str, workdir: str) -> Tuple[List[str], str]:
+    """Primera pasada: internar nombres y volcar las aristas como ids"""
+    names: List[str] = []
+    index: Dict[str, int] = {}
+
+    def intern(name: str) -> int:
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(name)
+        return i
+
+    raw_path = os.path.join(workdir, "edges.raw")
+    with open(raw_path, 'wb', buffering=_IO_BUFFER) as raw:
+        pack = _RAW_EDGE.pack
+        for u, v, weight in GraphFileIO.iter_records(source, strict=False):
+            if v is None:
+                intern(u)
+            else:
+                raw.write(pack(intern(u), intern(v), weight))
+    return names, raw_path
+
+
+def _sorted_runs(raw_path: str, rank: Sequence[int], workdir: str, chunk_size: int) -> List[str]:
+    """Segunda pasada: tramos ordenados por (origen, nombre del destino, secuencia)"""
+    runs = []
+    seq = 0
+    with open(raw_path, 'rb', buffering=_IO_BUFFER) as raw:
+        while True:
+            data = raw.read(chunk_size * _RAW_EDGE.size)
+            if not data:
+                break
+            records = []
+            for s, d, weight in _RAW_EDGE.iter_unpack(data):
+                records.append((s, rank[d], seq, d, weight))
+                if s != d:
+                    records.append((d, rank[s], seq, s, weight))
+                seq += 1
+            records.sort()
+            run_path = os.path.join(workdir, f"run{len(runs)}.bin")
+            with open(run_path, 'wb', buffering=_IO_BUFFER) as run:
+                pack = _RUN_RECORD.pack
+                for record in records:
+                    run.write(pack(*record))
+            runs.append(run_path)
+    return runs
+
+
+def _read_run(path: str) -> Iterator[tuple]:
+    size = _RUN_RECORD.size
+    with open(path, 'rb', buffering=_IO_BUFFER) as run:
+        while True:
+            data = run.read(size * 4096)
+            if not data:
+                return
+            yield from _RUN_RECORD.iter_unpack(data)
+
+
+def _merge_runs(runs: List[str], names: List[str], source: str, path: str, workdir: str):
+    """Combinar los tramos, quedarse con la última arista repetida y escribir el .graphbin"""
+    n = len(names)
+    offsets = array('q', [0]) * (n + 1)
+    targets_path = os.path.join(workdir, "targets.bin")
+    weights_path = os.path.join(workdir, "weights.bin")
+    m = loops = 0
+    with open(targets_path, 'wb', buffering=_IO_BUFFER) as targets, \
+            open(weights_path, 'wb', buffering=_IO_BUFFER) as weights:
+        pack_target, pack_weight = struct.Struct("=i").pack, struct.Struct("=d").pack
+        pending: Optional[tuple] = None
+        for record in heapq.merge(*(_read_run(run) for run in runs)):
+            # Dentro de un mismo (origen, destino) la secuencia crece: el último gana
+            if pending is not None and (pending[0], pending[1]) != (record[0], record[1]):
+                targets.write(pack_target(pending[3]))
+                weights.write(pack_weight(pending[4]))
+                offsets[pending[0] + 1] += 1
+                m += 1
+                loops += pending[0] == pending[3]
+            pending = record
+        if pending is not None:
+            targets.write(pack_target(pending[3]))
+            weights.write(pack_weight(pending[4]))
+            offsets[pending[0] + 1] += 1
+            m += 1
+            loops += pending[0] == pending[3]
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+
+    mtime_ns, size, sha = source_signature(source)
+    names_blob = "\0".join(names).encode('utf-8')
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, _BYTEORDER, mtime_ns, size, sha, n, m, (m - loops) // 2 + loops, len(names_blob)))
+        out.write(names_blob)
+        for part in (offsets.tobytes(), targets_path, weights_path):
+            out.write(bytes(_align(out.tell()) - out.tell()))
+            if isinstance(part, bytes):
+                out.write(part)
+            else:
+                with open(part, 'rb') as src:
+                    shutil.copyfileobj(src, out, _IO_BUFFER)
+    os.replace(tmp, path)
@@ -0,0 +1,99 @@
+"""
+Matriz de distancias entre todos los pares de municipios
+"""
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .compact import CompactGraph
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+# Hasta este número de nodos se usa Floyd–Warshall vectorizado (O(V³) en NumPy);
+# por encima, un Dijkstra por origen repartido entre procesos
+FLOYD_WARSHALL_MAX_NODES = 400
+# Orígenes por tarea enviada al pool de procesos
+ROWS_PER_TASK = 64
+
+_worker_csr: Optional[Tuple[Sequence[int], Sequence[int], Sequence[float]]] = None
+
+
+def distance_matrix(graph, workers: Optional[int] = None) -> Tuple["np.ndarray", Dict[str, int]]:
+    """Distancias mínimas (float32, ``inf`` si no hay ruta) y el índice nodo → fila"""
+    if np is None:
+        raise ImportError("NumPy es requerido para la matriz de distancias")
+    compact = graph if isinstance(graph, CompactGraph) else graph.freeze()
+    index = dict(compact.index)
+    if len(compact) <= FLOYD_WARSHALL_MAX_NODES:
+        matrix = floyd_warshall(compact)
+    else:
+        matrix = dijkstra_rows(compact, workers)
+    matrix.flags.writeable = False
+    return matrix, index
+
+
+def floyd_warshall(compact: CompactGraph) -> "np.ndarray":
+    n = len(compact)
+    dist = np.full((n, n), np.inf)
+    offsets, targets, weights = compact.as_numpy()
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    np.minimum.at(dist, (sources, targets), weights)
+    np.fill_diagonal(dist, 0.0)
+    for k in range(n):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist.astype(np.float32)
+
+
+def dijkstra_rows(compact: CompactGraph, workers: Optional[int] = None) -> "np.ndarray":
+    n = len(compact)
+    matrix = np.empty((n, n), dtype=np.float32)
+    workers = workers or os.cpu_count() or 1
+    chunks = [range(i, min(i + ROWS_PER_TASK, n)) for i in range(0, n, ROWS_PER_TASK)]
+    csr = (compact.offsets, compact.targets, compact.weights)
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            matrix[chunk.start:chunk.stop] = _rows(csr, chunk)
+        return matrix
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=csr) as pool:
+        for chunk, rows in zip(chunks, pool.map(_worker_rows, chunks)):
+            matrix[chunk.start:chunk.stop] = rows
+    return matrix
+
+
+def _init_worker(offsets, targets, weights):
+    global _worker_csr
+    _worker_csr = (offsets, targets, weights)
+
+
+def _worker_rows(sources: range) -> "np.ndarray":
+    return _rows(_worker_csr, sources)
+
+
+def _rows(csr, sources: range) -> "np.ndarray":
+    offsets, targets, weights = csr
+    n = len(offsets) - 1
+    out = np.full((len(sources), n), np.inf, dtype=np.float32)
+    for row, src in enumerate(sources):
+        dist: List[float] = [float('inf')] * n
+        done = bytearray(n)
+        dist[src] = 0.0
+        heap = [(0.0, src)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                nd = d + weights[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        out[row] = dist
+    return out
@@ -0,0 +1,263 @@
+"""
+Exportación sin pantalla (Agg) de la animación de un recorrido a GIF, MP4 o
+una secuencia de PNG
+"""
+import io
+import os
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .compact import CompactGraph
+from .file_io import ProgressCallback
+from .layout import LayoutCache, force_layout
+from .render import GraphRenderer
+
+try:
+    from matplotlib.animation import FFMpegWriter
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import GifImagePlugin, Image
+except ModuleNotFoundError:
+    FFMpegWriter = None
+    FigureCanvasAgg = None
+    Figure = None
+    GifImagePlugin = None
+    Image = None
+
+ALGORITHMS = ("bfs", "dfs", "shortest_path")
+# Con al menos estos cuadros se reparten entre procesos
+PARALLEL_MIN_FRAMES = 64
+# Cuadros consecutivos por tarea: cada tarea crea los artistas para el
+# primero y en los demás solo cambia el color del nodo nuevo
+FRAMES_PER_TASK = 32
+
+Position = Tuple[float, float]
+
+_worker_frames: Optional["_FrameRenderer"] = None
+
+
+def export_traversal(model, start: str, path: str, algorithm: str = "bfs", target: Optional[str] = None,
+                     pos: Optional[Dict[str, Position]] = None, fps: float = 1.0,
+                     figsize: Tuple[float, float] = (7, 6), dpi: int = 100, workers: Optional[int] = None,
+                     progress: Optional[ProgressCallback] = None) -> int:
+    """Escribir la animación de ``algorithm`` desde ``start`` sobre el grafo de
+    ``model`` (un GraphModel) y devolver el número de cuadros.
+
+    El formato sale de ``path``: ``.gif``, ``.mp4`` (requiere ffmpeg) o, con
+    cualquier otro nombre, un directorio con ``frame_00000.png``, ... El
+    cuadro k resalta los primeros k nodos del recorrido, como en la GUI. Cada
+    cuadro se codifica y se escribe apenas se dibuja; con muchos cuadros se
+    dibujan por tramos en varios procesos. Sin ``pos`` se usa la distribución
+    guardada para este grafo o se calcula una.
+    """
+    if Figure is None:
+        raise ImportError("Matplotlib es requerido para exportar animaciones")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconocido: '{algorithm}' (use {', '.join(ALGORITHMS)})")
+    graph = model.manual_graph
+    if start not in graph:
+        raise ValueError(f"Nodo '{start}' no existe en el grafo")
+    if algorithm == "shortest_path":
+        if target is None or target not in graph:
+            raise ValueError(f"Nodo '{target}' no existe en el grafo")
+        order = model.shortest_path(start, target)[1]
+        title = f"Ruta más corta {start} → {target}"
+    else:
+        order = getattr(model, algorithm)(start)
+        title = f"{algorithm.upper()} desde {start}"
+
+    if pos is None:
+        pos = LayoutCache().load(graph.get_nodes())
+    if pos is None:
+        pos = force_layout(graph, seed=42)
+        LayoutCache().save(pos)
+
+    kind = _format_of(path)
+    job = _FrameJob(graph.freeze(), pos, order, title, figsize, dpi, kind)
+    total = len(order) + 1
+    sink = _open_sink(kind, path, job, fps)
+    try:
+        for written, frame in enumerate(_frames(job, total, workers), 1):
+            sink.write(frame)
+            if progress is not None:
+                progress(written, total)
+    finally:
+        sink.close()
+    return total
+
+
+def _format_of(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".gif", ".mp4"):
+        return ext[1:]
+    return "png"
+
+
+class _FrameJob:
+    """Lo necesario para dibujar cualquier tramo de cuadros; se envía una vez a
+    cada proceso"""
+
+    def __init__(self, compact: CompactGraph, pos: Dict[str, Position], order: List[str], title: str,
+                 figsize: Tuple[float, float], dpi: int, kind: str):
+        self.compact = compact
+        self.pos = pos
+        self.order = order
+        self.title = title
+        self.figsize = figsize
+        self.dpi = dpi
+        self.kind = kind
+        # Paleta común de todos los cuadros del GIF (imagen en modo "P") y
+        # duración de cada uno en milisegundos
+        self.palette = None
+        self.duration = 0
+
+
+class _FrameRenderer:
+    """Figura Agg propia de un proceso que dibuja y codifica cuadros"""
+
+    def __init__(self, job: _FrameJob):
+        self.job = job
+        self.graph = job.compact.to_manual()
+        self.fig = Figure(figsize=job.figsize, dpi=job.dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.renderer = GraphRenderer(self.fig.add_subplot())
+
+    def frames(self, start: int, stop: int) -> Iterator[bytes]:
+        """Cuadros ``start`` .. ``stop - 1``. Los artistas se crean una vez por
+        tramo y cada cuadro se vuelve a rasterizar entero (sin estampar), así
+        los píxeles no dependen de dónde empieza el tramo ni de cuántos
+        procesos dibujan."""
+        self.draw(start)
+        yield self.encode()
+        for k in range(start + 1, stop):
+            self.renderer.set_node_color(self.job.order[k - 1])
+            self.canvas.draw()
+            yield self.encode()
+
+    def draw(self, highlighted: int):
+        """Dibujo completo con los primeros ``highlighted`` nodos resaltados"""
+        self.renderer.draw(self.graph, self.job.pos, self.job.order[:highlighted], title=self.job.title)
+        self.canvas.draw()
+
+    def image(self) -> "Image.Image":
+        return Image.frombuffer("RGBA", self.canvas.get_width_height(),
+                                bytes(self.canvas.buffer_rgba()), "raw", "RGBA", 0, 1).convert("RGB")
+
+    def encode(self) -> bytes:
+        image = self.image()
+        if self.job.kind == "gif":
+            frame = image.quantize(palette=self.job.palette, dither=Image.Dither.NONE)
+            return b"".join(GifImagePlugin.getdata(frame, duration=self.job.duration))
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+        return buffer.getvalue()
+
+
+def _frames(job: _FrameJob, total: int, workers: Optional[int]) -> Iterator[bytes]:
+    """Cuadros codificados en orden. En paralelo se mantienen a lo sumo dos
+    tramos por proceso en vuelo, así la memoria no crece con la animación."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or total < PARALLEL_MIN_FRAMES:
+        yield from _FrameRenderer(job).frames(0, total)
+        return
+
+    chunks = [(i, min(i + FRAMES_PER_TASK, total)) for i in range(0, total, FRAMES_PER_TASK)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_worker_chunk, *chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _init_worker(job: _FrameJob):
+    global _worker_frames
+    _worker_frames = _FrameRenderer(job)
+
+
+def _worker_chunk(start: int, stop: int) -> List[bytes]:
+    return list(_worker_frames.frames(start, stop))
+
+
+# ---------- Destinos ----------
+def _open_sink(kind: str, path: str, job: _FrameJob, fps: float):
+    if kind == "gif":
+        return _GifSink(path, job, fps)
+    if kind == "mp4":
+        return _FfmpegSink(path, fps)
+    return _PngSequenceSink(path)
+
+
+class _PngSequenceSink:
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.count = 0
+
+    def write(self, frame: bytes):
+        with open(os.path.join(self.directory, f"frame_{self.count:05d}.png"), 'wb') as file:
+            file.write(frame)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class _GifSink:
+    """GIF escrito cuadro a cuadro con una paleta global.
+
+    La paleta se calcula con el primer y el último cuadro (sin resaltar y con
+    todo el recorrido resaltado), que juntos tienen todos los colores; cada
+    cuadro se cuantiza a ella sin tramado y se agrega al archivo.
+    """
+
+    def __init__(self, path: str, job: _FrameJob, fps: float):
+        renderer = _FrameRenderer(job)
+        renderer.draw(0)
+        first = renderer.image()
+        renderer.draw(len(job.order))
+        last = renderer.image()
+        both = Image.new("RGB", (first.width, first.height * 2))
+        both.paste(first, (0, 0))
+        both.paste(last, (0, first.height))
+        job.palette = both.quantize(colors=256, dither=Image.Dither.NONE)
+        job.duration = int(1000 / fps)
+
+        header, _ = GifImagePlugin.getheader(job.palette.crop((0, 0, first.width, first.height)),
+                                             info={"loop": 0, "optimize": False})
+        self.file = open(path, 'wb')
+        self.file.write(b"".join(header))
+
+    def write(self, frame: bytes):
+        self.file.write(frame)
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+class _FfmpegSink:
+    """MP4 codificado por ffmpeg a medida que recibe los PNG por su entrada"""
+
+    def __init__(self, path: str, fps: float):
+        if not FFMpegWriter.isAvailable():
+            raise RuntimeError("ffmpeg es requerido para exportar MP4 (rcParams['animation.ffmpeg_path'])")
+        # libx264 con yuv420p necesita ancho y alto pares
+        self.process = subprocess.Popen(
+            [FFMpegWriter.bin_path(), "-y", "-loglevel", "error", "-f", "image2pipe", "-framerate", str(fps),
+             "-c:v", "png", "-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+             "-c:v", "libx264", "-pix_fmt", "yuv420p", path],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame: bytes):
+        self.process.stdin.write(frame)
+
+    def close(self):
+        self.process.stdin.close()
+        code = self.process.wait()
+        if code != 0:
+            raise RuntimeError(f"ffmpeg terminó con error ({code})")
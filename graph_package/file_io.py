@@ -1,43 +1,357 @@
 import csv
+import glob
+import gzip
+import io
+import lzma
 import os
-from typing import List, Tuple
+import xml.etree.ElementTree as ET
+from array import array
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
 from .graph import ManualGraph
+from .compact import CompactGraph
+
+# Tamaño del búfer de lectura para archivos grandes
+CSV_BUFFER_SIZE = 1 << 20
+# Extensiones reconocidas; el formato se decide por la extensión del archivo
+COMPRESSION_SUFFIXES = (".gz", ".xz")
+GRAPH_FILE_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.xz", "*.graphml", "*.graphml.gz", "*.graphml.xz")
+GRAPHML_NS = "http://graphml.graphdrawing.org/xmlns"
+# Política para aristas repetidas entre archivos: peso a conservar
+DUPLICATE_POLICIES = {
+    "min": min,
+    "max": max,
+    "last": lambda old, new: new,
+}
+# Registros leídos entre cada llamada al callback de progreso
+PROGRESS_INTERVAL = 10000
+# progress(bytes leídos, bytes totales); puede lanzar una excepción para cancelar la carga
+ProgressCallback = Callable[[int, int], None]
+# Errores mostrados en el mensaje de GraphFileError (la lista completa queda en .errors)
+MAX_REPORTED_ERRORS = 20
+
+
+class GraphFileError(ValueError):
+    """Errores de formato de un archivo de aristas, con su número de línea"""
+    
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        message = "\n".join(errors[:MAX_REPORTED_ERRORS])
+        if len(errors) > MAX_REPORTED_ERRORS:
+            message += f"\n... y {len(errors) - MAX_REPORTED_ERRORS} errores más."
+        super().__init__(message)
+
+
+class EdgeColumns:
+    """Aristas en búferes columnares con los nombres internados como enteros"""
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.src = array('i')
+        self.dst = array('i')
+        self.weights = array('d')
+    
+    def intern(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = len(self.names)
+            self.index[name] = i
+            self.names.append(name)
+        return i
+    
+    def append(self, u: str, v: str, weight: float):
+        self.src.append(self.intern(u))
+        self.dst.append(self.intern(v))
+        self.weights.append(weight)
+    
+    def edges(self) -> Iterator[Tuple[str, str, float]]:
+        names = self.names
+        for s, d, w in zip(self.src, self.dst, self.weights):
+            yield names[s], names[d], w
+    
+    def __len__(self) -> int:
+        return len(self.weights)
 
 
 class GraphFileIO:
     
     @staticmethod
-    def load_from_csv(graph: ManualGraph, filename: str) -> bool:
+    def file_format(filename: str) -> str:
+        """'graphml' o 'csv' según la extensión (ignorando .gz / .xz)"""
+        name = filename.lower()
+        for suffix in COMPRESSION_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        return "graphml" if name.endswith(".graphml") else "csv"
+    
+    @staticmethod
+    def open_text(filename: str, mode: str = 'r') -> TextIO:
+        """Abrir en modo texto, descomprimiendo/comprimiendo al vuelo .gz y .xz"""
+        name = filename.lower()
+        if name.endswith(".gz"):
+            return gzip.open(filename, mode + 't', encoding='utf-8', newline='')
+        if name.endswith(".xz"):
+            return lzma.open(filename, mode + 't', encoding='utf-8', newline='')
+        return open(filename, mode, encoding='utf-8', newline='', buffering=CSV_BUFFER_SIZE)
+    
+    @staticmethod
+    def _open_reader(filename: str) -> Tuple[TextIO, BinaryIO]:
+        """Como ``open_text`` para lectura, pero también devuelve el archivo
+        crudo: su posición da el avance real aunque esté comprimido"""
+        raw = open(filename, 'rb', buffering=CSV_BUFFER_SIZE)
+        name = filename.lower()
+        if name.endswith(".gz"):
+            return gzip.open(raw, 'rt', encoding='utf-8', newline=''), raw
+        if name.endswith(".xz"):
+            return lzma.open(raw, 'rt', encoding='utf-8', newline=''), raw
+        return io.TextIOWrapper(raw, encoding='utf-8', newline=''), raw
+    
+    @staticmethod
+    def read_edges(filename: str, strict: bool = True,
+                   progress: Optional[ProgressCallback] = None) -> EdgeColumns:
+        """Leer y validar el archivo de aristas en una sola pasada.
+        
+        En modo estricto cada fila debe tener exactamente 3 columnas, nombres no
+        vacíos y un peso numérico; se acumulan todos los errores y se lanza
+        GraphFileError al final. Sin modo estricto se ignoran las filas cortas.
+        """
+        columns = EdgeColumns()
+        append, intern = columns.append, columns.intern
+        for u, v, weight in GraphFileIO.iter_records(filename, strict=strict, progress=progress):
+            if v is None:
+                intern(u)
+            else:
+                append(u, v, weight)
+        return columns
+    
+    @staticmethod
+    def iter_records(filename: str, strict: bool = True,
+                     progress: Optional[ProgressCallback] = None) -> Iterator[Tuple[str, Optional[str], Optional[float]]]:
+        """Recorrer el archivo sin cargarlo: produce (u, v, peso) por arista y
+        (nodo, None, None) por cada nodo declarado sin aristas (GraphML).
+        Los errores de validación se lanzan juntos al terminar. ``progress``
+        se llama cada PROGRESS_INTERVAL registros y al final."""
+        if GraphFileIO.file_format(filename) == "graphml":
+            return GraphFileIO._iter_graphml(filename, strict, progress)
+        return GraphFileIO._iter_csv(filename, strict, progress)
+    
+    @staticmethod
+    def _iter_csv(filename: str, strict: bool, progress: Optional[ProgressCallback] = None):
+        errors: List[str] = []
+        total = os.path.getsize(filename)
+        file, raw = GraphFileIO._open_reader(filename)
+        with raw, file:
+            reader = csv.reader(file)
+            for row in reader:
+                if progress is not None and reader.line_num % PROGRESS_INTERVAL == 0:
+                    progress(raw.tell(), total)
+                if len(row) != 3:
+                    if strict:
+                        errors.append(f"Línea {reader.line_num}: se esperaban 3 columnas, pero se encontraron {len(row)}.")
+                        continue
+                    if len(row) < 3:
+                        continue
+                u, v, w = row[0].strip(), row[1].strip(), row[2]
+                if strict and (not u or not v):
+                    errors.append(f"Línea {reader.line_num}: los nombres de los nodos no pueden estar vacíos.")
+                    continue
+                try:
+                    weight = float(w)
+                except ValueError:
+                    error = f"Línea {reader.line_num}: el peso '{w}' no es un número válido."
+                    if not strict:
+                        raise GraphFileError([error])
+                    errors.append(error)
+                    continue
+                yield u, v, weight
+            if progress is not None:
+                progress(total, total)
+        if errors:
+            raise GraphFileError(errors)
+    
+    @staticmethod
+    def _iter_graphml(filename: str, strict: bool, progress: Optional[ProgressCallback] = None):
+        """GraphML con iterparse, liberando cada elemento ya procesado"""
+        errors: List[str] = []
+        weight_key = None
+        graph_elem = None
+        edge_count = 0
+        total = os.path.getsize(filename)
+        file, raw = GraphFileIO._open_reader(filename)
+        with raw, file:
+            for event, elem in ET.iterparse(file, events=("start", "end")):
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if event == "start":
+                    if tag == "graph":
+                        graph_elem = elem
+                    continue
+                if tag == "key":
+                    if elem.get("attr.name") == "weight" and elem.get("for", "edge") in ("edge", "all"):
+                        weight_key = elem.get("id")
+                    continue
+                # Mismo criterio que _iter_csv: sin ``strict`` se omiten los elementos
+                # incompletos y un peso inválido detiene la carga; con ``strict`` se
+                # reúnen todos los errores
+                if tag == "node":
+                    node = elem.get("id", "").strip()
+                    if node:
+                        yield node, None, None
+                    elif strict:
+                        errors.append("Nodo sin 'id': los nombres de los nodos no pueden estar vacíos.")
+                elif tag == "edge":
+                    edge_count += 1
+                    if progress is not None and edge_count % PROGRESS_INTERVAL == 0:
+                        progress(raw.tell(), total)
+                    u, v = elem.get("source", "").strip(), elem.get("target", "").strip()
+                    w = next((data.text for data in elem
+                              if data.tag.rsplit('}', 1)[-1] == "data" and data.get("key") == weight_key), None)
+                    if not u or not v:
+                        if strict:
+                            errors.append(f"Arista {edge_count}: los nombres de los nodos no pueden estar vacíos.")
+                    else:
+                        try:
+                            weight = float(w) if w is not None else 1.0
+                        except ValueError:
+                            error = f"Arista {edge_count}: el peso '{w}' no es un número válido."
+                            if not strict:
+                                raise GraphFileError([error])
+                            errors.append(error)
+                        else:
+                            yield u, v, weight
+                else:
+                    continue
+                if graph_elem is not None:
+                    graph_elem.clear()
+            if progress is not None:
+                progress(total, total)
+        if errors:
+            raise GraphFileError(errors)
+    
+    @staticmethod
+    def load_from_csv(graph: ManualGraph, filename: str, strict: bool = False,
+                      progress: Optional[ProgressCallback] = None) -> bool:
         if not os.path.exists(filename):
             return False
         
-        graph.clear()
         try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if len(row) >= 3:
-                        u, v, weight = row[0].strip(), row[1].strip(), float(row[2])
-                        graph.add_edge(u, v, weight)
-            return True
+            columns = GraphFileIO.read_edges(filename, strict=strict, progress=progress)
         except Exception as e:
+            if strict:
+                raise
             print(f"Error cargando CSV: {e}")
             return False
+        graph.load_columns(columns.names, columns.src, columns.dst, columns.weights)
+        return True
     
     @staticmethod
-    def save_to_csv(graph: ManualGraph, filename: str) -> bool:
+    def load_compact_csv(filename: str, strict: bool = False,
+                         progress: Optional[ProgressCallback] = None) -> CompactGraph:
+        """Cargar el CSV directamente como instantánea CSR, sin pasar por dicts"""
+        columns = GraphFileIO.read_edges(filename, strict=strict, progress=progress)
+        return CompactGraph.from_columns(columns.names, columns.src, columns.dst, columns.weights)
+    
+    @staticmethod
+    def load_shards(graph: ManualGraph, source: str, duplicate_policy: str = "min",
+                    workers: Optional[int] = None, strict: bool = False) -> bool:
+        """Cargar varios CSV de aristas (un directorio o un patrón glob) en paralelo.
+        
+        Cada proceso lee e interna un archivo; el proceso principal combina los
+        resultados en orden alfabético de archivo, por lo que el grafo final no
+        depende del orden en que terminan los procesos. Las aristas repetidas se
+        resuelven con ``duplicate_policy`` ("min", "max" o "last").
+        """
+        if duplicate_policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Política de duplicados desconocida: '{duplicate_policy}'")
+        if os.path.isdir(source):
+            paths = sorted({path for pattern in GRAPH_FILE_PATTERNS
+                            for path in glob.glob(os.path.join(source, pattern))})
+        else:
+            paths = sorted(glob.glob(source))
+        if not paths:
+            return False
+        
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        jobs = [(path, strict) for path in paths]
+        if workers <= 1:
+            shards = [_read_shard(job) for job in jobs]
+        else:
+            # concurrent.futures arrastra multiprocessing; solo se importa al repartir
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shards = list(pool.map(_read_shard, jobs))
+        
+        errors = [error for shard in shards if isinstance(shard, list) for error in shard]
+        if errors:
+            raise GraphFileError(errors)
+        
+        merged = EdgeColumns()
+        resolve = DUPLICATE_POLICIES[duplicate_policy]
+        best: Dict[Tuple[int, int], float] = {}
+        for shard in shards:
+            local = [merged.intern(name) for name in shard.names]
+            for s, d, weight in zip(shard.src, shard.dst, shard.weights):
+                s, d = local[s], local[d]
+                key = (s, d) if s <= d else (d, s)
+                best[key] = resolve(best[key], weight) if key in best else weight
+        for (s, d), weight in best.items():
+            merged.src.append(s)
+            merged.dst.append(d)
+            merged.weights.append(weight)
+        
+        graph.load_columns(merged.names, merged.src, merged.dst, merged.weights)
+        return True
+    
+    @staticmethod
+    def save_to_csv(graph: ManualGraph, filename: str, durable: bool = False) -> bool:
+        """Guardar como CSV o GraphML (opcionalmente .gz / .xz) según la extensión"""
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                for u, v, weight in graph.get_edges():
-                    writer.writerow([u, v, weight])
+            with GraphFileIO.open_text(filename, 'w') as file:
+                if GraphFileIO.file_format(filename) == "graphml":
+                    GraphFileIO.write_graphml(graph, file)
+                else:
+                    writer = csv.writer(file)
+                    for u, v, weight in graph.iter_edges():
+                        writer.writerow([u, v, weight])
+            if durable:
+                with open(filename, 'rb+') as file:
+                    os.fsync(file.fileno())
             return True
         except Exception as e:
             print(f"Error guardando CSV: {e}")
             return False
     
+    @staticmethod
+    def write_graphml(graph: ManualGraph, file: TextIO):
+        """Escribir GraphML elemento por elemento, sin construir el documento"""
+        # saxutils arrastra urllib; solo se importa al escribir GraphML
+        from xml.sax.saxutils import escape, quoteattr
+        write = file.write
+        write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        write(f'<graphml xmlns="{GRAPHML_NS}">\n')
+        write('  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n')
+        write('  <graph id="G" edgedefault="undirected">\n')
+        for node in graph.get_nodes():
+            write(f'    <node id={quoteattr(node)}/>\n')
+        for u, v, weight in graph.iter_edges():
+            write(f'    <edge source={quoteattr(u)} target={quoteattr(v)}>'
+                  f'<data key="weight">{escape(repr(float(weight)))}</data></edge>\n')
+        write('  </graph>\n</graphml>\n')
+    
     @staticmethod
     def load_from_edges(graph: ManualGraph, edges: List[Tuple[str, str, float]]):
         graph.clear()
         for u, v, weight in edges:
-            graph.add_edge(u.strip(), v.strip(), weight)
\ No newline at end of file
+            graph.add_edge(u.strip(), v.strip(), weight)
+
+
+def _read_shard(job: Tuple[str, bool]):
+    """Tarea de proceso: columnas del archivo o la lista de errores con su nombre"""
+    path, strict = job
+    try:
+        return GraphFileIO.read_edges(path, strict=strict)
+    except GraphFileError as e:
+        return [f"{os.path.basename(path)}: {error}" for error in e.errors]
+    except OSError as e:
+        return [f"{os.path.basename(path)}: {e}"]
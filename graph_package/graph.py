@@ -1,37 +1,139 @@
-from typing import Dict, List, Tuple
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+from .union_find import UnionFind
 
 
 class ManualGraph:
     
     def __init__(self):
         self.adjacency_list: Dict[str, Dict[str, float]] = {}
+        # Vecinos en orden alfabético, mantenidos con bisect en cada modificación
+        self._sorted_neighbors: Dict[str, List[str]] = {}
+        # Componentes conexas: incrementales al agregar, se reconstruyen al
+        # consultar después de una eliminación
+        self._components = UnionFind()
+        self._components_dirty = False
+        # Se incrementa con cada modificación; permite detectar datos derivados obsoletos
+        self.version = 0
+        # Observadores de modificaciones: fn(operación, argumentos)
+        self._listeners: List[Callable[[str, tuple], None]] = []
     
     
+    def add_listener(self, listener: Callable[[str, tuple], None]):
+        """Recibe ("add_node", (n,)), ("add_edge", (u, v, w)), ("remove_edge", (u, v)),
+        ("remove_node", (n,)) o ("reset", ()) cuando el contenido se reemplaza."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, tuple], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, op: str, args: tuple):
+        for listener in self._listeners:
+            listener(op, args)
+    
     def add_node(self, node: str):
-        if node not in self.adjacency_list:
-            self.adjacency_list[node] = {}
+        if self._insert_node(node) and self._listeners:
+            self._notify("add_node", (node,))
+    
+    def _insert_node(self, node: str) -> bool:
+        if node in self.adjacency_list:
+            return False
+        self.adjacency_list[node] = {}
+        self._sorted_neighbors[node] = []
+        if not self._components_dirty:
+            self._components.add(node)
+        self.version += 1
+        return True
     
     def add_edge(self, u: str, v: str, weight: float = 1.0):
-        self.add_node(u)
-        self.add_node(v)
+        self._insert_node(u)
+        self._insert_node(v)
         
+        if v not in self.adjacency_list[u]:
+            insort(self._sorted_neighbors[u], v)
+            if u != v:
+                insort(self._sorted_neighbors[v], u)
         self.adjacency_list[u][v] = weight
         self.adjacency_list[v][u] = weight
+        if not self._components_dirty:
+            self._components.union(u, v)
+        self.version += 1
+        if self._listeners:
+            self._notify("add_edge", (u, v, weight))
+    
+    def load_columns(self, names: Sequence[str], src: Sequence[int],
+                     dst: Sequence[int], weights: Sequence[float]):
+        """Reemplazar el contenido con aristas en columnas (ids sobre ``names``).
+        
+        Equivale a ``clear()`` seguido de ``add_edge`` fila por fila, pero
+        construye la adyacencia y los índices ordenados de una sola vez.
+        """
+        adjacency: Dict[str, Dict[str, float]] = {name: {} for name in names}
+        rows = [adjacency[name] for name in names]
+        for s, d, weight in zip(src, dst, weights):
+            rows[s][names[d]] = weight
+            rows[d][names[s]] = weight
+        
+        self.adjacency_list = adjacency
+        self._sorted_neighbors = {name: sorted(row) for name, row in adjacency.items()}
+        self._components = UnionFind()
+        self._components_dirty = True
+        self.version += 1
+        if self._listeners:
+            self._notify("reset", ())
+    
+    def load_compact(self, compact):
+        """Reemplazar el contenido con una instantánea CSR (bloques ya ordenados)"""
+        names, offsets, targets, weights = compact.names, compact.offsets, compact.targets, compact.weights
+        adjacency: Dict[str, Dict[str, float]] = {}
+        sorted_neighbors: Dict[str, List[str]] = {}
+        for i, name in enumerate(names):
+            start, end = offsets[i], offsets[i + 1]
+            block = list(map(names.__getitem__, targets[start:end]))
+            adjacency[name] = dict(zip(block, weights[start:end]))
+            sorted_neighbors[name] = block
+        
+        self.adjacency_list = adjacency
+        self._sorted_neighbors = sorted_neighbors
+        self._components = UnionFind()
+        self._components_dirty = True
+        self.version += 1
+        if self._listeners:
+            self._notify("reset", ())
     
     def remove_node(self, node: str):
         if node not in self.adjacency_list:
             return
         
         for neighbor in list(self.adjacency_list[node].keys()):
-            self.remove_edge(node, neighbor)
+            self._unlink(node, neighbor)
         
         del self.adjacency_list[node]
+        del self._sorted_neighbors[node]
+        self._components_dirty = True
+        self.version += 1
+        if self._listeners:
+            self._notify("remove_node", (node,))
     
     def remove_edge(self, u: str, v: str):
+        if self._unlink(u, v) and self._listeners:
+            self._notify("remove_edge", (u, v))
+    
+    def _unlink(self, u: str, v: str) -> bool:
+        removed = False
         if u in self.adjacency_list and v in self.adjacency_list[u]:
             del self.adjacency_list[u][v]
+            _discard_sorted(self._sorted_neighbors[u], v)
+            removed = True
         if v in self.adjacency_list and u in self.adjacency_list[v]:
             del self.adjacency_list[v][u]
+            _discard_sorted(self._sorted_neighbors[v], u)
+            removed = True
+        if removed:
+            self._components_dirty = True
+            self.version += 1
+        return removed
     
     def has_edge(self, u: str, v: str) -> bool:
         return (u in self.adjacency_list and 
@@ -47,25 +149,76 @@ class ManualGraph:
             return list(self.adjacency_list[node].keys())
         return []
     
+    def sorted_neighbors(self, node: str) -> Sequence[str]:
+        """Vecinos en orden alfabético. Devuelve el índice interno sin copiarlo:
+        no debe modificarse."""
+        return self._sorted_neighbors.get(node, ())
+    
+    def neighbor_items(self, node: str) -> Iterable[Tuple[str, float]]:
+        """Pares (vecino, peso) sin copiar la lista de adyacencia"""
+        if node in self.adjacency_list:
+            return self.adjacency_list[node].items()
+        return ()
+    
     def get_nodes(self) -> List[str]:
         return list(self.adjacency_list.keys())
     
     def get_edges(self) -> List[Tuple[str, str, float]]:
-        edges = []
-        visited = set()
-        
-        for u in self.adjacency_list:
-            for v, weight in self.adjacency_list[u].items():
-                edge = tuple(sorted([u, v]))
-                if edge not in visited:
-                    visited.add(edge)
-                    edges.append((u, v, weight))
-        
-        return edges
+        return list(self.iter_edges())
+    
+    def iter_edges(self) -> Iterator[Tuple[str, str, float]]:
+        """Aristas en el mismo orden que ``get_edges`` sin construir la lista"""
+        done = set()
+        for u, row in self.adjacency_list.items():
+            for v, weight in row.items():
+                if v not in done:
+                    yield u, v, weight
+            done.add(u)
     
     def clear(self):
         """Limpiar el grafo"""
         self.adjacency_list.clear()
+        self._sorted_neighbors.clear()
+        self._components = UnionFind()
+        self._components_dirty = False
+        self.version += 1
+        if self._listeners:
+            self._notify("reset", ())
+    
+    # ---------- Componentes conexas ----------
+    def component_of(self, node: str) -> str:
+        """Representante de la componente que contiene ``node``"""
+        if node not in self.adjacency_list:
+            raise ValueError(f"Nodo '{node}' no existe en el grafo")
+        return self._ensure_components().find(node)
+    
+    def same_component(self, u: str, v: str) -> bool:
+        if u not in self.adjacency_list or v not in self.adjacency_list:
+            return False
+        components = self._ensure_components()
+        return components.find(u) == components.find(v)
+    
+    def components(self) -> List[List[str]]:
+        components = self._ensure_components()
+        groups: Dict[str, List[str]] = {}
+        for node in self.adjacency_list:
+            groups.setdefault(components.find(node), []).append(node)
+        return list(groups.values())
+    
+    def component_count(self) -> int:
+        return self._ensure_components().count
+    
+    def _ensure_components(self) -> UnionFind:
+        if self._components_dirty:
+            components = UnionFind()
+            for node in self.adjacency_list:
+                components.add(node)
+            for u, row in self.adjacency_list.items():
+                for v in row:
+                    components.union(u, v)
+            self._components = components
+            self._components_dirty = False
+        return self._components
     
     def __contains__(self, node: str) -> bool:
         """Verificar si un nodo existe en el grafo"""
@@ -75,6 +228,11 @@ class ManualGraph:
         """Número de nodos en el grafo"""
         return len(self.adjacency_list)
     
+    def freeze(self):
+        """Instantánea compacta (CSR) de solo lectura"""
+        from .compact import CompactGraph
+        return CompactGraph.from_manual(self)
+    
     def to_networkx(self):
         """Convertir a NetworkX solo para visualización"""
         try:
@@ -90,4 +248,10 @@ class ManualGraph:
         for u, v, weight in self.get_edges():
             G.add_edge(u, v, weight=weight)
         
-        return G
\ No newline at end of file
+        return G
+
+
+def _discard_sorted(items: List[str], value: str):
+    i = bisect_left(items, value)
+    if i < len(items) and items[i] == value:
+        del items[i]
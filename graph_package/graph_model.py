@@ -1,10 +1,17 @@
 """
 Modelo principal del grafo que integra todas las funcionalidades
 """
-from typing import List, Tuple, Optional
+import os
+from typing import Dict, Iterator, List, Tuple, Optional
 from .graph import ManualGraph
-from .algorithms import GraphTraversal
-from .file_io import GraphFileIO
+from .algorithms import GraphTraversal, ShortestPaths, TraversalStep
+from .file_io import GraphFileIO, ProgressCallback
+from .compact import CompactGraph
+from .snapshot import open_snapshot, snapshot_path, write_snapshot
+from .journal import MutationJournal
+from .contraction import ContractionHierarchy, hierarchy_path
+from .cache import QueryCache
+from .tracing import Tracer
 
 
 class GraphCompatibilityWrapper:
@@ -51,28 +58,179 @@ class GraphCompatibilityWrapper:
 
 class GraphModel:
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256, use_snapshots: bool = False):
         self.manual_graph = ManualGraph()
+        # Mantener una instantánea binaria (.graphbin) junto a cada CSV
+        self.use_snapshots = use_snapshots
         self.traversal = GraphTraversal(self.manual_graph)
+        self.routes = ShortestPaths(self.manual_graph)
+        self.hierarchy: Optional[ContractionHierarchy] = None
+        self.cache = QueryCache(cache_size)
+        self.journal: Optional[MutationJournal] = None
         self.file_io = GraphFileIO()
     
     # ---------- I/O ----------
     def load_from_edges(self, edges: List[Tuple[str, str, float]]):
         self.file_io.load_from_edges(self.manual_graph, edges)
 
-    def load_from_csv(self, path: str, fallback: Optional[List[Tuple[str, str, float]]] = None):
-        if not self.file_io.load_from_csv(self.manual_graph, path) and fallback:
+    def load_from_csv(self, path: str, fallback: Optional[List[Tuple[str, str, float]]] = None,
+                      strict: bool = False, progress: Optional[ProgressCallback] = None):
+        """Con ``strict`` se valida cada fila y se lanza GraphFileError con
+        todos los errores encontrados; el grafo no se modifica en ese caso."""
+        if self.use_snapshots and os.path.exists(path):
+            try:
+                self.manual_graph.load_compact(self.load_compact(path, strict=strict, progress=progress))
+                return
+            except Exception as e:
+                if strict:
+                    raise
+                print(f"Error cargando CSV: {e}")
+                if fallback:
+                    self.file_io.load_from_edges(self.manual_graph, fallback)
+                return
+        if not self.file_io.load_from_csv(self.manual_graph, path, strict=strict, progress=progress) and fallback:
             self.file_io.load_from_edges(self.manual_graph, fallback)
 
+    def load_from_directory(self, source: str, duplicate_policy: str = "min",
+                            workers: Optional[int] = None, strict: bool = False) -> bool:
+        """Cargar en paralelo todos los CSV de un directorio o patrón glob"""
+        return self.file_io.load_shards(self.manual_graph, source, duplicate_policy, workers, strict)
+
+    def load_compact(self, path: str, strict: bool = False,
+                     progress: Optional[ProgressCallback] = None) -> CompactGraph:
+        """Instantánea CSR del CSV: se abre el .graphbin con mmap si está al día
+        y si no se reconstruye desde el texto."""
+        sidecar = snapshot_path(path)
+        compact = open_snapshot(sidecar, source=path)
+        if compact is None:
+            compact = self.file_io.load_compact_csv(path, strict=strict, progress=progress)
+            write_snapshot(compact, sidecar, source=path)
+        return compact
+
     def save_to_csv(self, path: str):
-        return self.file_io.save_to_csv(self.manual_graph, path)
+        saved = self.file_io.save_to_csv(self.manual_graph, path)
+        if saved and self.use_snapshots:
+            write_snapshot(self.manual_graph.freeze(), snapshot_path(path), source=path)
+        return saved
+
+    def open_journal(self, base_path: str) -> int:
+        """Reaplicar la bitácora pendiente de ``base_path`` y registrar las
+        modificaciones siguientes en ella; devuelve las operaciones reaplicadas."""
+        if self.journal is not None:
+            self.journal.close()
+        applied = MutationJournal.replay(self.manual_graph, base_path)
+        self.journal = MutationJournal(self.manual_graph, base_path)
+        self.journal.entries = applied
+        return applied
+
+    def take_journal(self, previous: "GraphModel"):
+        """Continuar la bitácora de ``previous`` al reemplazarlo por este modelo.
+        Como el contenido cambió por completo, el próximo guardado compacta."""
+        if previous.journal is None:
+            return
+        base_path = previous.journal.base_path
+        previous.journal.close()
+        previous.journal = None
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = MutationJournal(self.manual_graph, base_path)
+        self.journal.needs_compaction = True
+
+    def save(self, path: Optional[str] = None) -> bool:
+        """Guardar usando la bitácora si corresponde a ``path``; si no, reescribir el CSV"""
+        journal = self.journal
+        if journal is None or (path is not None and path != journal.base_path):
+            if path is None:
+                raise ValueError("No hay archivo donde guardar: indique la ruta o abra la bitácora")
+            return self.save_to_csv(path)
+        compacting = journal.should_compact()
+        saved = journal.save()
+        if saved and compacting and self.use_snapshots:
+            write_snapshot(self.manual_graph.freeze(), snapshot_path(journal.base_path), source=journal.base_path)
+        return saved
 
     # ---------- Algoritmos ----------
-    def bfs(self, start: str) -> List[str]:
-        return self.traversal.bfs(start)
+    def bfs(self, start: str, tracer: Optional[Tracer] = None) -> List[str]:
+        return self._traverse("bfs", self.traversal.bfs, start, tracer)
+
+    def dfs(self, start: str, tracer: Optional[Tracer] = None) -> List[str]:
+        return self._traverse("dfs", self.traversal.dfs, start, tracer)
+
+    def _traverse(self, name: str, fn, start: str, tracer: Optional[Tracer]) -> List[str]:
+        key = self._key(name, start)
+        if tracer is not None:
+            # Con tracer siempre se ejecuta para emitir los eventos
+            order = fn(start, tracer=tracer)
+            self.cache.put(key, tuple(order))
+            return order
+        return list(self.cache.get_or_compute(key, lambda: tuple(fn(start))))
+
+    def iter_bfs(self, start: str, **limits) -> Iterator[TraversalStep]:
+        return self.traversal.iter_bfs(start, **limits)
+
+    def iter_dfs(self, start: str, **limits) -> Iterator[TraversalStep]:
+        return self.traversal.iter_dfs(start, **limits)
+
+    def shortest_path(self, src: str, dst: str) -> Tuple[float, List[str]]:
+        def compute():
+            if self.hierarchy is not None:
+                distance, path = self.hierarchy.shortest_path(src, dst)
+            else:
+                distance, path = self.routes.shortest_path(src, dst)
+            return distance, tuple(path)
+
+        distance, path = self.cache.get_or_compute(self._key("shortest_path", src, dst), compute)
+        return distance, list(path)
+
+    def bidirectional_shortest_path(self, src: str, dst: str) -> Tuple[float, List[str]]:
+        return self.routes.bidirectional_shortest_path(src, dst)
+
+    def shortest_path_tree(self, src: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        return self.routes.shortest_path_tree(src)
+
+    def distance_row(self, src: str) -> Dict[str, float]:
+        """Distancias desde ``src`` a todos los nodos alcanzables"""
+        row = self.cache.get_or_compute(self._key("distance_row", src),
+                                        lambda: self.routes.shortest_path_tree(src)[0])
+        return dict(row)
+
+    def distance_matrix(self, workers: Optional[int] = None):
+        """Matriz float32 de solo lectura y su índice nodo → fila, reutilizada
+        mientras el grafo no cambie"""
+        from .distances import distance_matrix
+        return self.cache.get_or_compute(self._key("distance_matrix"),
+                                         lambda: distance_matrix(self.manual_graph, workers))
+
+    def component_of(self, node: str) -> str:
+        return self.manual_graph.component_of(node)
+
+    def same_component(self, u: str, v: str) -> bool:
+        return self.manual_graph.same_component(u, v)
+
+    def components(self) -> List[List[str]]:
+        return self.manual_graph.components()
+
+    def cache_info(self) -> Dict[str, int]:
+        return self.cache.stats()
+
+    def is_cached(self, name: str, *args) -> bool:
+        """Si la consulta ``name(*args)`` ya está en caché para esta versión del grafo"""
+        return self._key(name, *args) in self.cache
+
+    def _key(self, name: str, *args) -> tuple:
+        return (name, args, self.manual_graph.version)
+
+    # ---------- Preprocesamiento de rutas ----------
+    def preprocess_routes(self, csv_path: Optional[str] = None) -> ContractionHierarchy:
+        """Construir la jerarquía de contracción y guardarla junto al CSV"""
+        self.hierarchy = ContractionHierarchy.build(self.manual_graph)
+        if csv_path:
+            self.hierarchy.save(hierarchy_path(csv_path))
+        return self.hierarchy
 
-    def dfs(self, start: str) -> List[str]:
-        return self.traversal.dfs(start)
+    def load_hierarchy(self, csv_path: str) -> bool:
+        self.hierarchy = ContractionHierarchy.load(hierarchy_path(csv_path), self.manual_graph)
+        return self.hierarchy is not None
 
     @property
     def G(self):
@@ -1,49 +1,80 @@
 """
 Interfaz gráfica para el programa de grafos
 """
+import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .graph import ManualGraph
 from .graph_model import GraphModel
+from .layout import LayoutCache, force_layout, place_new_nodes
+from .node_search import NodeSearchIndex
+from .picker import NodePicker
+from .render import GraphRenderer
+from .tasks import BackgroundTask, ProgressTracer, TaskCancelled
 from .config import DEFAULT_CSV, SAMPLE_EDGES
 
+GRAPH_FILETYPES = [
+    ("Grafos", "*.csv *.csv.gz *.csv.xz *.graphml *.graphml.gz *.graphml.xz"),
+    ("CSV", "*.csv"),
+    ("CSV comprimido", "*.csv.gz *.csv.xz"),
+    ("GraphML", "*.graphml *.graphml.gz *.graphml.xz"),
+]
+# Intervalo de consulta del estado de la tarea en segundo plano
+TASK_POLL_MS = 100
+# Espera tras el último zoom o desplazamiento antes de recalcular lo visible
+VIEW_REFRESH_MS = 150
+# Espera tras la última edición antes de guardar en disco la distribución
+LAYOUT_SAVE_MS = 5000
+
 try:
     import matplotlib
-    import csv
     matplotlib.use("TkAgg")
     import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import networkx as nx
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
     GUI_AVAILABLE = True
 except ModuleNotFoundError:
     GUI_AVAILABLE = False
     plt = None
     FigureCanvasTkAgg = None
-    nx = None
+    NavigationToolbar2Tk = None
 
 
 class GraphApp:
     def __init__(self, master: tk.Tk):
         if not GUI_AVAILABLE:
-            raise ImportError("Matplotlib y NetworkX son requeridos para la GUI")
+            raise ImportError("Matplotlib es requerido para la GUI")
             
         self.master = master
         self.master.title("Departamento de Guatemala – Grafo de municipios (Implementación Manual)")
 
-        self.model = GraphModel()
+        self.model = GraphModel(use_snapshots=True)
         self.model.load_from_csv(DEFAULT_CSV, SAMPLE_EDGES)
+        self.model.open_journal(DEFAULT_CSV)
+        # Índice de nombres para los selectores; se actualiza solo con cada modificación
+        self.node_search = NodeSearchIndex(self.model.manual_graph)
 
         self.fig, self.ax = plt.subplots(figsize=(7, 6))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.master)
         self.canvas.get_tk_widget().grid(row=0, column=0, rowspan=10, sticky="nsew")
+        # Zoom y desplazamiento; al cambiar la vista se recalcula solo lo visible
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self.master, pack_toolbar=False)
+        self.toolbar.grid(row=10, column=0, sticky="ew")
+        self._view_job: Optional[str] = None
+        self._layout_job: Optional[str] = None
 
+        self.task: Optional[BackgroundTask] = None
         self._build_controls()
 
         self.pos: Dict[str, Tuple[float, float]] = {}
+        self.layouts = LayoutCache()
         self.visited_nodes: List[str] = []
         self.step_index = 0
         self.animation_running = False
 
+        # Conserva los artistas del último dibujo; la animación solo cambia sus colores
+        self.renderer = GraphRenderer(self.ax, on_view_change=self._on_view_change)
+
         self._draw_graph()
         print("[INFO] Aplicación iniciada con implementación manual del grafo")
 
@@ -56,11 +87,13 @@ class GraphApp:
 
         tk.Label(ctrl, text="Municipio inicial").pack(pady=(5, 0))
         self.start_var = tk.StringVar()
-        self.start_cb = ttk.Combobox(ctrl, textvariable=self.start_var, state="readonly")
-        self.start_cb.pack(pady=2, fill="x")
+        self.start_picker = NodePicker(ctrl, self.node_search, rows=6, on_select=self.start_var.set)
+        self.start_picker.pack(pady=2, fill="x")
+        tk.Label(ctrl, textvariable=self.start_var, font=("Arial", 8, "bold")).pack(fill="x")
 
         ttk.Button(ctrl, text=" BFS", command=lambda: self._run_traversal(self.model.bfs)).pack(fill="x", pady=2)
         ttk.Button(ctrl, text=" DFS", command=lambda: self._run_traversal(self.model.dfs)).pack(fill="x", pady=2)
+        ttk.Button(ctrl, text=" Ruta más corta", command=self._run_shortest_path).pack(fill="x", pady=2)
         ttk.Separator(ctrl, orient="horizontal").pack(fill="x", pady=5)
 
         tk.Label(ctrl, text="Edición", font=("Arial", 10, "bold")).pack(pady=(5, 2))
@@ -72,41 +105,53 @@ class GraphApp:
 
         tk.Label(ctrl, text="Archivo", font=("Arial", 10, "bold")).pack(pady=(5, 2))
         ttk.Button(ctrl, text="📂 Cargar CSV", command=self._load_csv).pack(fill="x", pady=2)
+        ttk.Button(ctrl, text="📁 Cargar carpeta", command=self._load_directory).pack(fill="x", pady=2)
         ttk.Button(ctrl, text="💾 Guardar CSV", command=self._save_csv).pack(fill="x", pady=2)
+        ttk.Button(ctrl, text="📤 Exportar", command=self._export_file).pack(fill="x", pady=2)
         
         ttk.Separator(ctrl, orient="horizontal").pack(fill="x", pady=5)
         tk.Label(ctrl, text="Información", font=("Arial", 10, "bold")).pack(pady=(5, 2))
         self.info_label = tk.Label(ctrl, text="", justify="left", font=("Arial", 8))
         self.info_label.pack(pady=2, fill="x")
 
+        ttk.Separator(ctrl, orient="horizontal").pack(fill="x", pady=5)
+        self.status_label = tk.Label(ctrl, text="Listo", justify="left", font=("Arial", 8))
+        self.status_label.pack(pady=2, fill="x")
+        self.progress_bar = ttk.Progressbar(ctrl, mode="determinate", maximum=1000)
+        self.progress_bar.pack(pady=2, fill="x")
+        self.cancel_button = ttk.Button(ctrl, text="Cancelar", command=self._cancel_task, state="disabled")
+        self.cancel_button.pack(fill="x", pady=2)
+
         self.master.columnconfigure(0, weight=1)
         self.master.rowconfigure(0, weight=1)
 
-        self._refresh_combo()
+        self._refresh_picker()
         self._update_info()
 
-    def _combo_dialog(self, title: str, prompt: str, values: List[str]) -> Optional[str]:
-        if not values:
+    def _pick_dialog(self, title: str, prompt: str, exclude: Tuple[str, ...] = ()) -> Optional[str]:
+        """Elegir un municipio buscando por prefijo (``exclude`` no se ofrece)"""
+        if self.node_search.count("", exclude) == 0:
             return None
         dlg = tk.Toplevel(self.master)
         dlg.title(title)
         dlg.grab_set()
-        dlg.geometry("300x150")
         dlg.resizable(False, False)
         
-        tk.Label(dlg, text=prompt).pack(padx=10, pady=5)
-        sel_var = tk.StringVar(value=values[0])
-        cb = ttk.Combobox(dlg, textvariable=sel_var, values=values, state="readonly")
-        cb.pack(padx=10, pady=5, fill="x")
-        cb.focus_set()
-
         result: Optional[str] = None
 
-        def on_ok():
+        def on_ok(node: Optional[str] = None):
             nonlocal result
-            result = sel_var.get()
+            result = node or picker.get()
+            if result is None:
+                messagebox.showwarning("Advertencia", "Seleccione un municipio.", parent=dlg)
+                return
             dlg.destroy()
 
+        tk.Label(dlg, text=prompt).pack(padx=10, pady=5)
+        picker = NodePicker(dlg, self.node_search, exclude=exclude, on_activate=on_ok)
+        picker.pack(padx=10, pady=5, fill="x")
+        picker.focus_set()
+
         def on_cancel():
             dlg.destroy()
 
@@ -118,49 +163,166 @@ class GraphApp:
         dlg.wait_window()
         return result
 
-    def _sorted_nodes(self) -> List[str]:
-        return sorted(self.model.G.nodes())
-
-    def _refresh_combo(self):
-        nodes = self._sorted_nodes()
-        self.start_cb["values"] = nodes
-        if self.start_var.get() not in nodes and nodes:
-            self.start_var.set(nodes[0])
+    def _refresh_picker(self):
+        self.start_picker.refresh()
+        if self.start_var.get() not in self.node_search:
+            self.start_var.set(self.node_search.first() or "")
 
     def _update_info(self):
         """Actualizar información del grafo"""
         nodes = len(self.model.G)
         edges = len(list(self.model.G.edges()))
-        info_text = f"Municipios: {nodes}\nCarreteras: {edges}"
+        components = self.model.manual_graph.component_count()
+        info_text = f"Municipios: {nodes}\nCarreteras: {edges}\nComponentes: {components}"
         self.info_label.config(text=info_text)
 
-    def _invalidate_layout(self):
-        self.pos.clear()
+    # ---------- Tareas en segundo plano ----------
+    def _busy(self) -> bool:
+        """Mientras corre una tarea el modelo no se modifica ni se lanza otra"""
+        if self.task is None:
+            return False
+        messagebox.showwarning("Tarea en curso", f"Espere o cancele: {self.task.label}")
+        return True
+
+    def _run_in_background(self, label: str, work: Callable[[BackgroundTask], Any],
+                           on_done: Callable[[Any], None], error_title: str = "Error") -> bool:
+        if self.task is not None:
+            return False
+        self.task = BackgroundTask(work, label).start()
+        self._task_done = on_done
+        self._task_error_title = error_title
+        self.status_label.config(text=f"{label}...")
+        self.progress_bar.config(mode="indeterminate")
+        self.progress_bar.start()
+        self.cancel_button.config(state="normal")
+        self.master.after(TASK_POLL_MS, self._poll_task)
+        return True
+
+    def _poll_task(self):
+        task = self.task
+        if task is None:
+            return
+        done, total = task.progress
+        if total > 0:
+            if str(self.progress_bar["mode"]) != "determinate":
+                self.progress_bar.stop()
+                self.progress_bar.config(mode="determinate")
+            self.progress_bar["value"] = 1000 * done / total
+        if not task.done():
+            self.master.after(TASK_POLL_MS, self._poll_task)
+            return
+
+        self.task = None
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=0)
+        self.cancel_button.config(state="disabled")
+        try:
+            result = task.outcome()
+        except TaskCancelled:
+            self.status_label.config(text=f"Cancelado: {task.label}")
+            return
+        except Exception as e:
+            self.status_label.config(text="Listo")
+            messagebox.showerror(self._task_error_title, str(e))
+            return
+        self.status_label.config(text="Listo")
+        self._task_done(result)
+
+    def _cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.status_label.config(text=f"Cancelando: {self.task.label}...")
+
+    def _swap_model(self, model: GraphModel, pos: Dict[str, Tuple[float, float]]):
+        """Reemplazar de una vez el modelo visible por uno cargado en segundo plano"""
+        model.take_journal(self.model)
+        self.model = model
+        self.node_search.close()
+        self.node_search = NodeSearchIndex(model.manual_graph)
+        self.start_picker.index = self.node_search
+        self.pos = pos
+        self._refresh_picker()
+        self._update_info()
+        self._draw_graph(reset_view=True)
+
+    def _compute_layout(self, graph: ManualGraph, task: BackgroundTask) -> Dict[str, Tuple[float, float]]:
+        """Distribución completa: la guardada para este conjunto de nodos o una
+        nueva que se guarda. Se ejecuta en el hilo de trabajo, así que no toca Tk."""
+        cached = self.layouts.load(graph.get_nodes())
+        if cached is not None:
+            return cached
+        pos = force_layout(graph, seed=42, progress=task.report)
+        if pos:
+            self.layouts.save(pos)
+        return pos
 
     def _load_csv(self):
-        path = filedialog.askopenfilename(filetypes=[("CSV", "*.csv")])
+        if self._busy():
+            return
+        path = filedialog.askopenfilename(filetypes=GRAPH_FILETYPES)
         if not path:
             return
-        try:
-            self.validar_archivo(path)
-            self.model.load_from_csv(path)
-            self._refresh_combo()
-            self._update_info()
-            self._invalidate_layout()
-            self._draw_graph()
+
+        def work(task: BackgroundTask):
+            model = GraphModel(use_snapshots=True)
+            model.load_from_csv(path, strict=True, progress=task.report)
+            return model, self._compute_layout(model.manual_graph, task)
+
+        def done(result):
+            self._swap_model(*result)
             messagebox.showinfo("Cargar", f"Grafo cargado desde {path}")
-        except Exception as e:
-            messagebox.showerror("Error de carga de archivo", e)
+
+        self._run_in_background(f"Cargando {os.path.basename(path)}", work, done,
+                                error_title="Error de carga de archivo")
+
+    def _load_directory(self):
+        if self._busy():
+            return
+        path = filedialog.askdirectory()
+        if not path:
+            return
+
+        def work(task: BackgroundTask):
+            model = GraphModel(use_snapshots=True)
+            if not model.load_from_directory(path, strict=True):
+                return None
+            return model, self._compute_layout(model.manual_graph, task)
+
+        def done(result):
+            if result is None:
+                messagebox.showinfo("Cargar", f"No se encontraron archivos CSV en {path}")
+                return
+            self._swap_model(*result)
+            messagebox.showinfo("Cargar", f"Grafo cargado desde {path}")
+
+        self._run_in_background(f"Cargando {os.path.basename(path)}", work, done,
+                                error_title="Error de carga de archivo")
+
     def _save_csv(self):
+        if self._busy():
+            return
      #  path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
         path = DEFAULT_CSV
         if path:
-            if self.model.save_to_csv(path):
+            if self.model.save(path):
                 messagebox.showinfo("Guardar", f"Grafo guardado en {path}")
             else:
                 messagebox.showerror("Error", "No se pudo guardar el archivo")
 
+    def _export_file(self):
+        if self._busy():
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=GRAPH_FILETYPES)
+        if not path:
+            return
+        if self.model.save_to_csv(path):
+            messagebox.showinfo("Exportar", f"Grafo exportado a {path}")
+        else:
+            messagebox.showerror("Error", "No se pudo exportar el archivo")
+
     def _add_node(self):
+        if self._busy():
+            return
         name = simpledialog.askstring("Agregar municipio", "Nombre del municipio:")
         if not name:
             return
@@ -170,43 +332,42 @@ class GraphApp:
             return
         
         self.model.G.add_node(name)
-        self._refresh_combo()
+        self._refresh_picker()
         self._update_info()
 
         if len(self.model.G) > 1:
             response = messagebox.askyesno("Conectar", f"¿Desea conectar '{name}' con otro municipio?")
             if response:
-                dest = self._combo_dialog("Conectar municipio", f"Conectar '{name}' con:", 
-                                        [n for n in self._sorted_nodes() if n != name])
+                dest = self._pick_dialog("Conectar municipio", f"Conectar '{name}' con:", exclude=(name,))
                 if dest:
                     dist = simpledialog.askfloat("Distancia", f"Distancia km entre '{name}' y '{dest}':")
                     if dist is not None and dist > 0:
                         self.model.G.add_edge(name, dest, weight=dist)
 
-        self._invalidate_layout()
         self._draw_graph()
 
     def _remove_node(self):
-        node = self._combo_dialog("Eliminar municipio", "Seleccione municipio:", self._sorted_nodes())
+        if self._busy():
+            return
+        node = self._pick_dialog("Eliminar municipio", "Seleccione municipio:")
         if node and node in self.model.G:
             self.model.G.remove_node(node)
-            self._refresh_combo()
+            self._refresh_picker()
             self._update_info()
-            self._invalidate_layout()
             self._draw_graph()
 
     def _add_edge(self):
-        nodes = self._sorted_nodes()
-        if len(nodes) < 2:
+        if self._busy():
+            return
+        if len(self.node_search) < 2:
             messagebox.showinfo("Información", "Se necesitan al menos dos municipios.")
             return
         
-        src = self._combo_dialog("Agregar carretera", "Municipio origen:", nodes)
+        src = self._pick_dialog("Agregar carretera", "Municipio origen:")
         if not src:
             return
         
-        dst = self._combo_dialog("Agregar carretera", "Municipio destino:", 
-                               [n for n in nodes if n != src])
+        dst = self._pick_dialog("Agregar carretera", "Municipio destino:", exclude=(src,))
         if not dst:
             return
         
@@ -221,112 +382,159 @@ class GraphApp:
         
         self.model.G.add_edge(src, dst, weight=dist)
         self._update_info()
-        self._invalidate_layout()
         self._draw_graph()
 
     def _remove_edge(self):
-        nodes = self._sorted_nodes()
-        if len(nodes) < 2:
+        if self._busy():
+            return
+        if len(self.node_search) < 2:
             return
         
-        src = self._combo_dialog("Eliminar carretera", "Municipio origen:", nodes)
+        src = self._pick_dialog("Eliminar carretera", "Municipio origen:")
         if not src:
             return
         
-        dst = self._combo_dialog("Eliminar carretera", "Municipio destino:", 
-                               [n for n in nodes if n != src])
+        dst = self._pick_dialog("Eliminar carretera", "Municipio destino:", exclude=(src,))
         if not dst:
             return
         
         if self.model.G.has_edge(src, dst):
             self.model.G.remove_edge(src, dst)
             self._update_info()
-            self._invalidate_layout()
             self._draw_graph()
         else:
             messagebox.showerror("Error", "La carretera no existe.")
 
-    def _draw_graph(self, highlight: Optional[List[str]] = None):
-        nx_graph = self.model.manual_graph.to_networkx()
-        if nx_graph is None:
-            self.ax.clear()
-            self.ax.text(0.5, 0.5, "NetworkX no disponible\npara visualización", 
-                       ha='center', va='center', transform=self.ax.transAxes)
-            self.canvas.draw()
-            return
-
-        if set(self.pos) != set(nx_graph.nodes()):
+    def _draw_graph(self, highlight: Optional[List[str]] = None, reset_view: bool = False):
+        """Dibujar el grafo; tras una edición se conserva el zoom salvo con ``reset_view``"""
+        graph = self.model.manual_graph
+        if highlight is None and self.animation_running:
+            # Una edición a mitad de la animación conserva el tramo ya recorrido
+            highlight = self.visited_nodes[:self.step_index - 1]
+        if len(self.pos) != len(graph) or any(node not in self.pos for node in graph.get_nodes()):
             if self.pos:
-                fixed = {n: self.pos[n] for n in self.pos if n in nx_graph}
-                self.pos = nx.spring_layout(nx_graph, seed=42, pos=fixed, fixed=list(fixed))
+                # Tras una edición se conservan las posiciones y solo se ubican los nodos nuevos
+                self.pos = place_new_nodes(graph, self.pos)
+                self._schedule_layout_save()
             else:
-                self.pos = nx.spring_layout(nx_graph, seed=42)
-
-        self.ax.clear()
-        
-        node_colors = []
-        for node in nx_graph.nodes():
-            if highlight and node in highlight:
-                node_colors.append("orange")
-            else:
-                node_colors.append("#1f78b4")
-
-        nx.draw_networkx(nx_graph, pos=self.pos, ax=self.ax, 
-                       node_color=node_colors, with_labels=True, 
-                       font_size=8, node_size=500)
-        
-        labels = nx.get_edge_attributes(nx_graph, "weight")
-        nx.draw_networkx_edge_labels(nx_graph, pos=self.pos, 
-                                   edge_labels=labels, ax=self.ax, font_size=7)
-        
-        self.ax.set_title("Grafo de Municipios (Implementación Manual)")
-        self.ax.axis("off")
+                # Distribución completa en segundo plano; se dibuja al terminar
+                def done(pos):
+                    self.pos = pos
+                    self._draw_graph(highlight, reset_view=True)
+
+                self._run_in_background("Calculando distribución",
+                                        lambda task: self._compute_layout(graph, task), done)
+                return
+
+        self.renderer.draw(graph, self.pos, highlight or (),
+                           title="Grafo de Municipios (Implementación Manual)", keep_view=not reset_view)
+        if reset_view:
+            # La vista inicial del nuevo dibujo pasa a ser la de "Inicio" de la barra
+            self.toolbar.update()
         self.canvas.draw()
 
+    def _schedule_layout_save(self):
+        """Una serie de ediciones escribe la distribución una sola vez, al
+        terminar; las distribuciones completas se guardan al calcularse"""
+        if self._layout_job is not None:
+            self.master.after_cancel(self._layout_job)
+        self._layout_job = self.master.after(LAYOUT_SAVE_MS, self._save_layout)
+
+    def _save_layout(self):
+        self._layout_job = None
+        self.layouts.save(self.pos)
+
+    def _on_view_change(self):
+        """Los límites cambian en cada movimiento al desplazar; se recalcula
+        una sola vez cuando la vista se detiene"""
+        if self._view_job is not None:
+            self.master.after_cancel(self._view_job)
+        self._view_job = self.master.after(VIEW_REFRESH_MS, self._refresh_view)
+
+    def _refresh_view(self):
+        self._view_job = None
+        if self.renderer.update_view():
+            self.canvas.draw_idle()
+
     def _run_traversal(self, fn):
+        if self._busy():
+            return
         start = self.start_var.get()
         if not start:
             messagebox.showwarning("Advertencia", "Seleccione un municipio inicial.")
             return
         
-        try:
-            print(f"\n[INFO] Ejecutando {fn.__name__.upper()} desde {start}")
-            self.visited_nodes = fn(start)
+        name, model = fn.__name__, self.model
+        total = len(model.manual_graph)
+
+        def work(task: BackgroundTask):
+            if model.is_cached(name, start):
+                return fn(start)
+            return fn(start, tracer=ProgressTracer(task, total))
+
+        def done(order):
+            self.visited_nodes = order
             print(f"[INFO] Resultado: {self.visited_nodes}")
-        except ValueError as e:
-            messagebox.showerror("Error", str(e))
+            print(f"[INFO] Caché: {self.model.cache_info()}")
+            self._start_animation()
+
+        print(f"\n[INFO] Ejecutando {name.upper()} desde {start}")
+        self._run_in_background(f"{name.upper()} desde {start}", work, done)
+
+    def _run_shortest_path(self):
+        if self._busy():
+            return
+        start = self.start_var.get()
+        if not start:
+            messagebox.showwarning("Advertencia", "Seleccione un municipio inicial.")
             return
         
-        self._start_animation()
+        dst = self._pick_dialog("Ruta más corta", f"Destino desde '{start}':", exclude=(start,))
+        if not dst:
+            return
+        
+        def done(result):
+            distance, path = result
+            if not path:
+                messagebox.showinfo("Ruta más corta", f"No existe ruta entre '{start}' y '{dst}'.")
+                return
+            
+            print(f"[INFO] Ruta {start} → {dst}: {path} ({distance:g} km)")
+            self.visited_nodes = path
+            self._start_animation()
+            messagebox.showinfo("Ruta más corta", f"{' → '.join(path)}\n\nDistancia total: {distance:g} km")
+
+        model = self.model
+        self._run_in_background(f"Ruta {start} → {dst}", lambda task: model.shortest_path(start, dst), done)
+
+    def _reset_highlight(self):
+        """Volver al color base; solo hace falta un dibujo completo si había resaltados"""
+        if self.renderer.reset_colors():
+            self.canvas.draw()
+
+    def _blit_nodes(self, changed: List[str]):
+        """Pintar solo los nodos ``changed`` encima del cuadro actual y copiar los
+        ejes a pantalla, así cada paso cuesta O(grado) artistas."""
+        if self.renderer.stamp_nodes(changed):
+            self.canvas.blit(self.ax.bbox)
 
     def _start_animation(self):
         if self.animation_running:
             return
         self.step_index = 0
         self.animation_running = True
+        self._reset_highlight()
         self._animate_step()
 
     def _animate_step(self):
         if self.step_index <= len(self.visited_nodes):
-            current_highlight = self.visited_nodes[:self.step_index]
-            self._draw_graph(highlight=current_highlight)
+            # Cada paso agrega un nodo resaltado; los anteriores ya lo están
+            if self.step_index > 0:
+                node = self.visited_nodes[self.step_index - 1]
+                self.renderer.set_node_color(node)
+                self._blit_nodes([node])
             self.step_index += 1
             self.master.after(1000, self._animate_step)
         else:
             self.animation_running = False
-            print("[INFO] Animación completada")
-
-    def validar_archivo(self, path: str):
-        with open(path, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for i, row in enumerate(reader, start=1):
-                if len(row) != 3:
-                    raise ValueError(f"Línea {i}: se esperaban 3 columnas, pero se encontraron {len(row)}.")
-                u, v, w = row
-                u, v = u.strip(), v.strip()
-                if not u or not v:
-                    raise ValueError(f"Línea {i}: los nombres de los nodos no pueden estar vacíos.")
-                try:
-                    weight = float(w)
-                except ValueError:
-                    raise ValueError(f"Línea {i}: el peso '{w}' no es un número válido.")
\ No newline at end of file
+            print("[INFO] Animación completada")
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Bitácora de modificaciones (solo anexar) para guardar en O(cambios)
+
+Cada línea es un registro CSV:
+    n,<nodo>              agregar nodo
+    +,<u>,<v>,<peso>      agregar/actualizar arista
+    -,<u>,<v>             eliminar arista
+    x,<nodo>              eliminar nodo
+    c                     fin de un guardado
+
+Las modificaciones quedan en memoria hasta ``save()``, que las anexa junto con
+la marca ``c``; al reaplicar solo cuentan las operaciones anteriores a la
+última marca, así que lo no guardado y un guardado a medias se descartan.
+Reaplicar la bitácora sobre un estado que ya la contiene da el mismo
+resultado, así que una caída entre el reemplazo del CSV base y el vaciado
+de la bitácora no corrompe el grafo.
+"""
+import csv
+import io
+import os
+from contextlib import contextmanager
+from typing import List, TextIO
+
+from .config import JOURNAL_COMPACT_MIN_OPS, JOURNAL_SUFFIX
+from .graph import ManualGraph
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    fcntl = None
+
+_OPS = {"add_node": "n", "add_edge": "+", "remove_edge": "-", "remove_node": "x"}
+_COMMIT = "c"
+# Así termina en el archivo la marca escrita por csv.writer
+_COMMIT_LINE = b"c\r\n"
+
+
+def journal_path(base_path: str) -> str:
+    return base_path + JOURNAL_SUFFIX
+
+
+class MutationJournal:
+    """Registra las modificaciones de un ManualGraph sobre un CSV base.
+
+    Las operaciones se acumulan en ``pending`` y llegan al archivo solo al
+    guardar, con un fsync por guardado. Si el contenido del grafo se reemplaza
+    por completo (clear / carga), la bitácora deja de anexar hasta la próxima
+    compactación, que reescribe el CSV base. Anexar y compactar toman un
+    bloqueo exclusivo (flock) sobre la bitácora cuando el sistema lo ofrece.
+    """
+
+    def __init__(self, graph: ManualGraph, base_path: str):
+        self.graph = graph
+        self.base_path = base_path
+        self.path = journal_path(base_path)
+        self.entries = 0
+        self.pending: List[list] = []
+        self.needs_compaction = not os.path.exists(base_path)
+        self._file: TextIO = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        with self._locked():
+            self._drop_uncommitted()
+        graph.add_listener(self._record)
+
+    # ---------- Registro ----------
+    def _record(self, op: str, args: tuple):
+        if op == "reset":
+            self.needs_compaction = True
+            self.pending.clear()
+            return
+        if self.needs_compaction:
+            return
+        if op == "add_edge":
+            u, v, weight = args
+            self.pending.append(["+", u, v, repr(float(weight))])
+        else:
+            self.pending.append([_OPS[op], *args])
+        self.entries += 1
+
+    def _commit(self):
+        """Anexar las operaciones pendientes y la marca de guardado, y sincronizar"""
+        if self.pending:
+            self._writer.writerows(self.pending)
+            self._writer.writerow([_COMMIT])
+            self.pending.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _drop_uncommitted(self):
+        """Recortar lo escrito después de la última marca (un guardado
+        interrumpido), para que lo que se anexe después no lo confirme"""
+        self._file.flush()
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        last = data.rfind(b"\n" + _COMMIT_LINE)
+        end = last + 1 + len(_COMMIT_LINE) if last >= 0 else 0
+        if end < len(data):
+            self._file.truncate(end)
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    # ---------- Guardado ----------
+    def should_compact(self) -> bool:
+        return self.needs_compaction or self.entries >= max(JOURNAL_COMPACT_MIN_OPS, len(self.graph))
+
+    def save(self) -> bool:
+        """Guardar en O(cambios); compacta solo cuando la bitácora creció demasiado"""
+        if self.should_compact():
+            return self.compact()
+        try:
+            with self._locked():
+                self._commit()
+        except OSError as e:
+            print(f"Error guardando bitácora: {e}")
+            return False
+        return True
+
+    def compact(self) -> bool:
+        """Reescribir el CSV base de forma atómica y vaciar la bitácora"""
+        from .file_io import GraphFileIO
+
+        # El temporal conserva la extensión para guardar en el mismo formato
+        directory, name = os.path.split(self.base_path)
+        tmp = os.path.join(directory, ".tmp-" + name)
+        try:
+            with self._locked():
+                if not self.needs_compaction:
+                    # Confirmar antes lo pendiente: si hay una caída antes de
+                    # vaciar la bitácora, reaplicarla sigue dando este estado
+                    self._commit()
+                if not GraphFileIO.save_to_csv(self.graph, tmp, durable=True):
+                    return False
+                os.replace(tmp, self.base_path)
+                _fsync_dir(self.base_path)
+                self._file.truncate(0)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            print(f"Error compactando bitácora: {e}")
+            return False
+        self.pending.clear()
+        self.entries = 0
+        self.needs_compaction = False
+        return True
+
+    def close(self):
+        """Dejar de registrar; lo no guardado se descarta"""
+        self.graph.remove_listener(self._record)
+        self.pending.clear()
+        self._file.close()
+
+    # ---------- Recuperación ----------
+    @staticmethod
+    def replay(graph: ManualGraph, base_path: str) -> int:
+        """Aplicar al grafo las operaciones guardadas (anteriores a la última
+        marca); devuelve cuántas se aplicaron."""
+        path = journal_path(base_path)
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as file:
+            data = file.read()
+        last = data.rfind(b"\n" + _COMMIT_LINE)
+        if last < 0:
+            return 0
+        applied = 0
+        with io.StringIO(data[:last + 1].decode('utf-8', errors='replace'), newline='') as file:
+            for row in csv.reader(file):
+                try:
+                    op = row[0]
+                    if op == "+":
+                        graph.add_edge(row[1], row[2], float(row[3]))
+                    elif op == "-":
+                        graph.remove_edge(row[1], row[2])
+                    elif op == "n":
+                        graph.add_node(row[1])
+                    elif op == "x":
+                        graph.remove_node(row[1])
+                    else:
+                        continue
+                except (IndexError, ValueError):
+                    continue
+                applied += 1
+        return applied
+
+
+def _fsync_dir(path: str):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,267 @@
+"""
+Distribución de los nodos en el plano: dirigida por fuerzas (Barnes–Hut),
+colocación incremental y caché en disco
+"""
+import hashlib
+import json
+import math
+import os
+import random
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .compact import CompactGraph
+from .config import LAYOUT_CACHE_DIR, LAYOUT_CACHE_MAX_FILES, LAYOUT_ITERATIONS
+from .graph import ManualGraph
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+Position = Tuple[float, float]
+
+# Criterio de Barnes–Hut: una celda de ancho s a distancia d cuenta como un
+# solo cuerpo si s / d < THETA (0 = repulsión exacta)
+THETA = 0.8
+# Profundidad máxima del quadtree
+MAX_TREE_DEPTH = 15
+
+
+def force_layout(graph, pos: Optional[Dict[str, Position]] = None, iterations: int = LAYOUT_ITERATIONS,
+                 seed: int = 42, theta: float = THETA,
+                 progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Position]:
+    """Distribución de Fruchterman–Reingold sobre el CSR del grafo.
+
+    La atracción por arista se calcula vectorizada y la repulsión entre
+    todos los pares con un quadtree (Barnes–Hut, O(n log n) por iteración).
+    Con ``pos`` se parte de esas posiciones (los nodos que falten se ubican
+    junto a sus vecinos) y se enfría desde una temperatura menor, de modo que
+    la distribución se ajusta sin desarmarse. El resultado queda centrado en
+    el origen dentro de [-1, 1] y depende solo de ``seed`` y la entrada.
+    ``progress(iteración, iterations)`` se llama después de cada iteración.
+    """
+    if np is None:
+        raise ImportError("NumPy es requerido para force_layout()")
+    compact = graph if isinstance(graph, CompactGraph) else graph.freeze()
+    n = len(compact)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {compact.names[0]: (0.0, 0.0)}
+
+    if pos:
+        start = place_new_nodes(graph, pos)
+        positions = np.array([start[name] for name in compact.names], dtype=float)
+        warm = True
+    else:
+        positions = np.random.default_rng(seed).random((n, 2))
+        warm = False
+    offsets, targets, _ = compact.as_numpy()
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    once = sources < targets
+    src, dst = sources[once], targets[once].astype(np.int64)
+
+    span = float((positions.max(axis=0) - positions.min(axis=0)).max()) or 1.0
+    k = span / math.sqrt(n)
+    if warm and len(src):
+        # Distancia ideal con la que la distribución previa no se expande ni se
+        # contrae en conjunto (virial: Σ aristas d³/k = pares · k²)
+        lengths = np.sqrt(((positions[src] - positions[dst]) ** 2).sum(axis=1))
+        k = float(((lengths ** 3).sum() / (n * (n - 1) / 2)) ** (1 / 3)) or k
+    temperature = span * (0.01 if warm else 0.1)
+    cooling = temperature / (iterations + 1)
+
+    for iteration in range(iterations):
+        force = _repulsion(positions, k * k, theta)
+        delta = positions[src] - positions[dst]
+        pull = delta * (np.sqrt((delta * delta).sum(axis=1)) / k)[:, None]
+        for axis in (0, 1):
+            force[:, axis] += np.bincount(dst, pull[:, axis], n) - np.bincount(src, pull[:, axis], n)
+        length = np.maximum(np.sqrt((force * force).sum(axis=1)), 1e-12)
+        positions += force * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+        if progress is not None:
+            progress(iteration + 1, iterations)
+
+    positions -= positions.mean(axis=0)
+    positions /= np.abs(positions).max() or 1.0
+    return {name: (float(x), float(y)) for name, (x, y) in zip(compact.names, positions)}
+
+
+def _repulsion(positions: "np.ndarray", k2: float, theta: float) -> "np.ndarray":
+    """Fuerza de repulsión k²/d de todos los nodos sobre cada uno.
+
+    El quadtree se arma por niveles con claves de celda enteras; los pares
+    (nodo, celda) se recorren nivel por nivel: las celdas lejanas aportan su
+    masa en el centro de masa y las cercanas se abren en sus hijas. En las
+    hojas se suman los nodos uno por uno.
+    """
+    n = len(positions)
+    low = positions.min(axis=0)
+    size = float((positions.max(axis=0) - low).max()) or 1.0
+    depth = max(1, min(MAX_TREE_DEPTH, math.ceil(math.log2(n) / 2) + 1))
+    cells = np.minimum(((positions - low) * ((1 << depth) / size)).astype(np.int64), (1 << depth) - 1)
+    ix, iy = cells[:, 0], cells[:, 1]
+
+    levels = []
+    for level in range(depth + 1):
+        shift = depth - level
+        keys, inverse = np.unique(((ix >> shift) << level) | (iy >> shift), return_inverse=True)
+        mass = np.bincount(inverse, minlength=len(keys)).astype(float)
+        center = np.stack([np.bincount(inverse, positions[:, 0], len(keys)),
+                           np.bincount(inverse, positions[:, 1], len(keys))], axis=1) / mass[:, None]
+        levels.append((keys, mass, center))
+    leaf_order = np.argsort(inverse, kind='stable')
+    leaf_start = np.concatenate(([0], np.cumsum(levels[-1][1].astype(np.int64))))
+
+    force = np.zeros((n, 2))
+    node = np.arange(n)
+    cell = np.zeros(n, dtype=np.int64)
+    for level, (keys, mass, center) in enumerate(levels):
+        delta = positions[node] - center[cell]
+        d2 = (delta * delta).sum(axis=1)
+        width = size / (1 << level)
+        far = width * width < theta * theta * d2
+        _accumulate(force, node[far], delta[far] * (k2 * mass[cell[far]] / d2[far])[:, None])
+        node, cell = node[~far], cell[~far]
+        if level == depth:
+            break
+        # Abrir las celdas cercanas en sus (hasta) cuatro hijas existentes
+        parent = keys[cell]
+        cx, cy = parent >> level, parent & ((1 << level) - 1)
+        child_keys = np.concatenate([(((cx << 1) | dx) << (level + 1)) | ((cy << 1) | dy)
+                                     for dx in (0, 1) for dy in (0, 1)])
+        child_node = np.tile(node, 4)
+        next_keys = levels[level + 1][0]
+        slot = np.minimum(np.searchsorted(next_keys, child_keys), len(next_keys) - 1)
+        found = next_keys[slot] == child_keys
+        node, cell = child_node[found], slot[found]
+
+    # Hojas: interacción exacta con cada nodo de la celda
+    counts = leaf_start[cell + 1] - leaf_start[cell]
+    first = np.repeat(leaf_start[cell] - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    other = leaf_order[first + np.arange(counts.sum())]
+    node = np.repeat(node, counts)
+    distinct = node != other
+    node, other = node[distinct], other[distinct]
+    delta = positions[node] - positions[other]
+    d2 = np.maximum((delta * delta).sum(axis=1), 1e-18)
+    _accumulate(force, node, delta * (k2 / d2)[:, None])
+    return force
+
+
+def _accumulate(force: "np.ndarray", node: "np.ndarray", values: "np.ndarray"):
+    n = len(force)
+    force[:, 0] += np.bincount(node, values[:, 0], n)
+    force[:, 1] += np.bincount(node, values[:, 1], n)
+
+
+def node_set_key(nodes: Iterable[str]) -> str:
+    """Hash del conjunto de nodos (no depende del orden)"""
+    digest = hashlib.sha256()
+    for node in sorted(nodes):
+        digest.update(node.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def place_new_nodes(graph: ManualGraph, pos: Dict[str, Position], spread: float = 0.05) -> Dict[str, Position]:
+    """Conservar las posiciones de los nodos que siguen en el grafo y ubicar
+    cada nodo nuevo junto al promedio de sus vecinos ya ubicados.
+
+    Los nodos nuevos sin vecinos ubicados se reparten alrededor del centro
+    del dibujo. El desplazamiento de cada nodo depende solo de su nombre, así
+    que el resultado es reproducible.
+    """
+    placed = {node: p for node, p in pos.items() if node in graph}
+    pending = sorted(node for node in graph.get_nodes() if node not in placed)
+    if not pending:
+        return placed
+
+    if placed:
+        xs = [p[0] for p in placed.values()]
+        ys = [p[1] for p in placed.values()]
+        span = max(max(xs) - min(xs), max(ys) - min(ys)) or 1.0
+        center = ((max(xs) + min(xs)) / 2, (max(ys) + min(ys)) / 2)
+    else:
+        span, center = 1.0, (0.0, 0.0)
+
+    while pending:
+        remaining = []
+        for node in pending:
+            anchors = [placed[n] for n in graph.get_neighbors(node) if n in placed]
+            if not anchors:
+                remaining.append(node)
+                continue
+            x = sum(p[0] for p in anchors) / len(anchors)
+            y = sum(p[1] for p in anchors) / len(anchors)
+            placed[node] = _jitter(node, x, y, spread * span)
+        if len(remaining) == len(pending):
+            for node in remaining:
+                placed[node] = _jitter(node, center[0], center[1], span / 2)
+            break
+        pending = remaining
+    return placed
+
+
+def _jitter(node: str, x: float, y: float, radius: float) -> Position:
+    rng = random.Random(node)
+    angle = rng.uniform(0, 2 * math.pi)
+    r = radius * rng.uniform(0.5, 1.0)
+    return x + r * math.cos(angle), y + r * math.sin(angle)
+
+
+class LayoutCache:
+    """Posiciones guardadas en disco, un archivo JSON por conjunto de nodos.
+
+    Al reabrir un grafo ya dibujado se reutiliza su distribución sin
+    recalcularla. Se conservan los ``max_files`` archivos usados más
+    recientemente.
+    """
+
+    def __init__(self, directory: str = LAYOUT_CACHE_DIR, max_files: int = LAYOUT_CACHE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+
+    def path(self, nodes: Iterable[str]) -> str:
+        return os.path.join(self.directory, node_set_key(nodes) + ".json")
+
+    def load(self, nodes: Iterable[str]) -> Optional[Dict[str, Position]]:
+        nodes = set(nodes)
+        path = self.path(nodes)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            pos = {node: (float(x), float(y)) for node, (x, y) in data["pos"].items()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error leyendo distribución guardada: {e}")
+            return None
+        if set(pos) != nodes:
+            return None
+        os.utime(path)
+        return pos
+
+    def save(self, pos: Dict[str, Position]) -> bool:
+        path = self.path(pos)
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as file:
+                json.dump({"pos": {node: [float(x), float(y)] for node, (x, y) in pos.items()}}, file)
+            os.replace(tmp, path)
+            self._prune()
+            return True
+        except OSError as e:
+            print(f"Error guardando distribución: {e}")
+            return False
+
+    def _prune(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith(".json")]
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_files]:
+            os.remove(path)
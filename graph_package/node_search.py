@@ -0,0 +1,116 @@
+"""
+Índice de búsqueda por prefijo de los nombres de nodo
+"""
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Iterable, List, Optional, Set, Tuple
+
+from .graph import ManualGraph
+
+# Mayor que cualquier carácter: cierra el rango de claves que empiezan con un prefijo
+_PREFIX_END = "\U0010ffff"
+
+
+def search_key(text: str) -> str:
+    """Forma de comparación: sin mayúsculas, sin tildes y sin espacios repetidos.
+    Un espacio final se conserva para que "san " no coincida con "Santa"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", plain).lstrip()
+
+
+class NodeSearchIndex:
+    """Nombres de nodo ordenados por su clave de búsqueda.
+
+    Las coincidencias de un prefijo son un rango contiguo que se ubica con
+    bisect, y se piden por ventanas (``offset``, ``limit``) sin copiar la
+    lista. El índice escucha al grafo y se actualiza en O(n) de memmove por
+    nodo agregado o eliminado; solo se reconstruye cuando el contenido se
+    reemplaza por completo.
+    """
+
+    def __init__(self, graph: ManualGraph):
+        self.graph = graph
+        self._entries: List[Tuple[str, str]] = []
+        self._names: Set[str] = set()
+        self._rebuild()
+        graph.add_listener(self._on_change)
+
+    def close(self):
+        self.graph.remove_listener(self._on_change)
+
+    def _rebuild(self):
+        self._names = set(self.graph.get_nodes())
+        self._entries = sorted((search_key(name), name) for name in self._names)
+
+    def _on_change(self, op: str, args: tuple):
+        if op == "add_node":
+            self._insert(args[0])
+        elif op == "add_edge":
+            # add_edge crea los extremos que falten sin avisar add_node
+            self._insert(args[0])
+            self._insert(args[1])
+        elif op == "remove_node":
+            self._remove(args[0])
+        elif op == "reset":
+            self._rebuild()
+
+    def _insert(self, name: str):
+        if name not in self._names:
+            self._names.add(name)
+            insort(self._entries, (search_key(name), name))
+
+    def _remove(self, name: str):
+        i = self._rank(name)
+        if i is not None:
+            del self._entries[i]
+            self._names.discard(name)
+
+    def _rank(self, name: str) -> Optional[int]:
+        if name not in self._names:
+            return None
+        entry = (search_key(name), name)
+        i = bisect_left(self._entries, entry)
+        return i if i < len(self._entries) and self._entries[i] == entry else None
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        key = search_key(prefix)
+        return (bisect_left(self._entries, (key,)),
+                bisect_left(self._entries, (key + _PREFIX_END,)))
+
+    # ---------- Consultas ----------
+    def count(self, prefix: str = "", exclude: Iterable[str] = ()) -> int:
+        lo, hi = self._range(prefix)
+        return hi - lo - len(self._skipped(lo, hi, exclude))
+
+    def search(self, prefix: str = "", offset: int = 0, limit: int = 20,
+               exclude: Iterable[str] = ()) -> List[str]:
+        """Las coincidencias ``offset`` .. ``offset + limit - 1`` de ``prefix``
+        en orden alfabético, sin contar los nodos de ``exclude``"""
+        lo, hi = self._range(prefix)
+        skipped = self._skipped(lo, hi, exclude)
+        start = lo + max(offset, 0)
+        for i in skipped:
+            if i <= start:
+                start += 1
+        result = []
+        for i in range(start, hi):
+            if len(result) >= limit:
+                break
+            if i not in skipped:
+                result.append(self._entries[i][1])
+        return result
+
+    def _skipped(self, lo: int, hi: int, exclude: Iterable[str]) -> List[int]:
+        ranks = (self._rank(name) for name in exclude)
+        return sorted(i for i in ranks if i is not None and lo <= i < hi)
+
+    def first(self) -> Optional[str]:
+        return self._entries[0][1] if self._entries else None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._entries)
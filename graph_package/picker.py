@@ -0,0 +1,144 @@
+"""
+Selector de municipios con búsqueda y lista virtual para la GUI
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Iterable, List, Optional
+
+from .node_search import NodeSearchIndex
+
+# Filas visibles de la lista; solo esas se cargan en el Listbox
+PICKER_ROWS = 10
+
+
+class NodePicker(tk.Frame):
+    """Entrada de búsqueda por prefijo sobre un NodeSearchIndex y una lista
+    que muestra solo una ventana de ``rows`` coincidencias.
+
+    La barra de desplazamiento, la rueda y las flechas mueven la ventana
+    sobre el total de coincidencias; al cambiar de ventana se piden al
+    índice solo esas filas. ``on_select`` recibe cada nodo elegido y
+    ``on_activate`` el confirmado con Enter o doble clic.
+    """
+
+    def __init__(self, master, index: NodeSearchIndex, exclude: Iterable[str] = (), rows: int = PICKER_ROWS,
+                 on_select: Optional[Callable[[str], None]] = None,
+                 on_activate: Optional[Callable[[str], None]] = None):
+        super().__init__(master)
+        self.index = index
+        self.exclude = set(exclude)
+        self.rows = rows
+        self.on_select = on_select
+        self.on_activate = on_activate
+        self.selected: Optional[str] = None
+        self.offset = 0
+        self.total = 0
+        self.window: List[str] = []
+
+        self.query = tk.StringVar()
+        self.entry = ttk.Entry(self, textvariable=self.query)
+        self.entry.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.listbox = tk.Listbox(self, height=rows, exportselection=False, activestyle="none")
+        self.listbox.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._scroll)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.count_label = tk.Label(self, anchor="w", font=("Arial", 8))
+        self.count_label.grid(row=2, column=0, columnspan=2, sticky="ew")
+        self.columnconfigure(0, weight=1)
+
+        self.query.trace_add("write", lambda *_: self._search())
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<Double-Button-1>", lambda event: self._activate())
+        for widget in (self.entry, self.listbox):
+            widget.bind("<Return>", lambda event: self._activate())
+            widget.bind("<Down>", lambda event: self._move(1))
+            widget.bind("<Up>", lambda event: self._move(-1))
+            widget.bind("<Next>", lambda event: self._move(self.rows))
+            widget.bind("<Prior>", lambda event: self._move(-self.rows))
+        self.listbox.bind("<MouseWheel>", lambda event: self._show(self.offset - (1 if event.delta > 0 else -1)))
+        self.listbox.bind("<Button-4>", lambda event: self._show(self.offset - 1))
+        self.listbox.bind("<Button-5>", lambda event: self._show(self.offset + 1))
+        self.refresh()
+
+    def refresh(self):
+        """Volver a consultar la ventana actual (tras modificar el grafo)"""
+        if self.selected is not None and self.selected not in self.index:
+            self.selected = None
+        self._show(self.offset)
+
+    def get(self) -> Optional[str]:
+        """El nodo elegido; si no se eligió ninguno, el que coincide exactamente
+        con el texto o la única coincidencia"""
+        if self.selected is not None:
+            return self.selected
+        text = self.query.get().strip()
+        if text in self.index and text not in self.exclude:
+            return text
+        if self.total == 1:
+            return self.index.search(self.query.get(), 0, 1, self.exclude)[0]
+        return None
+
+    def focus_set(self):
+        self.entry.focus_set()
+
+    def _search(self):
+        self.selected = None
+        self._show(0)
+
+    def _show(self, offset: int):
+        prefix = self.query.get()
+        self.total = self.index.count(prefix, self.exclude)
+        self.offset = max(0, min(offset, self.total - self.rows))
+        self.window = self.index.search(prefix, self.offset, self.rows, self.exclude)
+        self.listbox.delete(0, "end")
+        if self.window:
+            self.listbox.insert("end", *self.window)
+        if self.selected in self.window:
+            self.listbox.selection_set(self.window.index(self.selected))
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(self.window)) / self.total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.count_label.config(text=f"{self.total} coincidencias" if self.total != 1 else "1 coincidencia")
+
+    def _scroll(self, action: str, amount: str, unit: Optional[str] = None):
+        if action == "moveto":
+            self._show(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = int(amount) * (self.rows if unit == "pages" else 1)
+            self._show(self.offset + step)
+
+    def _on_listbox_select(self, event=None):
+        chosen = self.listbox.curselection()
+        if chosen:
+            self._select(self.window[chosen[0]])
+
+    def _select(self, node: str):
+        self.selected = node
+        if self.on_select is not None:
+            self.on_select(node)
+
+    def _move(self, step: int) -> str:
+        """Mover la selección ``step`` filas, desplazando la ventana si sale de ella"""
+        if not self.total:
+            return "break"
+        current = self.window.index(self.selected) + self.offset if self.selected in self.window else -1
+        target = max(0, min(current + step, self.total - 1))
+        if target < self.offset:
+            self._show(target)
+        elif target >= self.offset + self.rows:
+            self._show(target - self.rows + 1)
+        row = target - self.offset
+        self.listbox.selection_clear(0, "end")
+        self.listbox.selection_set(row)
+        self.listbox.see(row)
+        self._select(self.window[row])
+        return "break"
+
+    def _activate(self) -> str:
+        node = self.get()
+        if node is not None:
+            self._select(node)
+            if self.on_activate is not None:
+                self.on_activate(node)
+        return "break"
@@ -0,0 +1,351 @@
+"""
+Dibujo del grafo en matplotlib directamente desde ManualGraph (sin networkx)
+"""
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import AGGREGATE_GRID, AGGREGATE_MIN_NODES, EDGE_LABEL_MAX_EDGES, NODE_LABEL_MAX_NODES
+
+try:
+    import numpy as np
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import to_rgba
+    from matplotlib.transforms import Bbox
+except ModuleNotFoundError:
+    np = None
+    Bbox = None
+    LineCollection = None
+    to_rgba = None
+
+NODE_COLOR = "#1f78b4"
+HIGHLIGHT_COLOR = "orange"
+EDGE_COLOR = "black"
+# Margen alrededor de los nodos, como fracción del tamaño del dibujo
+AXES_MARGIN = 0.08
+# Lo que queda a esta fracción de la vista fuera de ella también se dibuja,
+# así un desplazamiento corto no deja huecos mientras se recalcula
+CULL_MARGIN = 0.1
+# Tamaño de los nodos sin etiqueta y de un grupo de un solo nodo, relativo a node_size
+SMALL_NODE_SCALE = 0.2
+CLUSTER_NODE_SCALE = 0.05
+
+
+class GraphRenderer:
+    """Dibuja nodos, aristas y etiquetas a partir de arreglos de posiciones.
+
+    ``draw`` guarda los arreglos del grafo y ``update_view`` crea solo los
+    artistas que caen dentro de los límites actuales de los ejes, con un
+    nivel de detalle según cuánto se ve: pesos de arista si hay a lo sumo
+    EDGE_LABEL_MAX_EDGES aristas, nombres si hay a lo sumo
+    NODE_LABEL_MAX_NODES nodos, y por encima de AGGREGATE_MIN_NODES los nodos
+    se agrupan en una cuadrícula (un marcador por celda). Las aristas van en
+    una sola LineCollection y los nodos en un solo scatter. Las etiquetas
+    son un Text por nodo o arista (matplotlib no agrupa textos), acotadas por
+    esos umbrales; las que siguen visibles tras mover la vista se conservan.
+    """
+
+    def __init__(self, ax, node_size: float = 500, font_size: float = 8, edge_font_size: float = 7,
+                 on_view_change: Optional[Callable[[], None]] = None):
+        if np is None:
+            raise ImportError("Matplotlib es requerido para dibujar el grafo")
+        self.ax = ax
+        self.node_size = node_size
+        self.font_size = font_size
+        self.edge_font_size = edge_font_size
+        # Se llama cuando cambian los límites de los ejes (zoom o desplazamiento)
+        self.on_view_change = on_view_change
+        self.node_artist = None
+        self.edge_artist = None
+        # Nodo → índice de su marcador (en modo agrupado, el de su celda)
+        self.node_index: Dict[str, int] = {}
+        self.node_colors = np.empty((0, 4))
+        self.highlighted: Dict[str, Tuple[float, float, float, float]] = {}
+        self.label_artists: Dict[str, object] = {}
+        self.edge_label_artists: Dict[int, object] = {}
+        self.aggregated = False
+        self._names: List[str] = []
+        self._xy = np.empty((0, 2))
+        self._ends = np.empty((0, 2), dtype=np.int64)
+        self._weights: List[float] = []
+        self._view: Optional[Tuple[float, float, float, float]] = None
+        self._shown: Optional[tuple] = None
+        # Píxeles de los ejes sin nodos ni etiquetas, para estampar sobre ellos
+        self._background = None
+        self._background_bounds: Optional[Tuple[int, ...]] = None
+        # Etiquetas en orden de dibujo y su caja en píxeles (x0, y0, x1, y1) en esa vista
+        self._stamp_texts: List[object] = []
+        self._stamp_boxes = np.empty((0, 4))
+
+    def draw(self, graph, pos: Dict[str, Tuple[float, float]], highlight: Iterable[str] = (),
+             title: Optional[str] = None, keep_view: bool = False):
+        """Cargar el grafo y dibujar la vista; con ``keep_view`` se conservan
+        los límites actuales (zoom) en lugar de ajustarlos a todo el grafo."""
+        ax = self.ax
+        limits = (ax.get_xlim(), ax.get_ylim()) if keep_view and self._names else None
+        ax.clear()
+        self.node_artist = self.edge_artist = None
+        self.label_artists, self.edge_label_artists = {}, {}
+
+        names = graph.get_nodes()
+        self._names = names
+        index = {name: i for i, name in enumerate(names)}
+        self._xy = np.array([pos[name] for name in names], dtype=float).reshape(-1, 2)
+        edges = list(graph.iter_edges())
+        self._ends = np.array([(index[u], index[v]) for u, v, _ in edges], dtype=np.int64).reshape(-1, 2)
+        self._weights = [weight for _, _, weight in edges]
+        segments = self._xy[self._ends]
+        self._edge_low, self._edge_high = segments.min(axis=1), segments.max(axis=1)
+        marked = to_rgba(HIGHLIGHT_COLOR)
+        self.highlighted = {name: marked for name in highlight if name in index}
+
+        if limits is not None:
+            ax.set_xlim(*limits[0])
+            ax.set_ylim(*limits[1])
+        else:
+            self._fit_limits(self._xy)
+        if title:
+            ax.set_title(title)
+        ax.axis("off")
+        # ax.clear() quita los callbacks; se vuelven a conectar
+        ax.callbacks.connect("xlim_changed", self._limits_changed)
+        ax.callbacks.connect("ylim_changed", self._limits_changed)
+        self._view = self._shown = self._background = None
+        self.update_view()
+
+    def _fit_limits(self, xy: "np.ndarray"):
+        if len(xy) == 0:
+            return
+        low, high = xy.min(axis=0), xy.max(axis=0)
+        pad = max(float((high - low).max()), 1e-9) * AXES_MARGIN
+        self.ax.set_xlim(low[0] - pad, high[0] + pad)
+        self.ax.set_ylim(low[1] - pad, high[1] + pad)
+
+    def _limits_changed(self, ax):
+        if self.on_view_change is not None:
+            self.on_view_change()
+
+    # ---------- Vista ----------
+    def update_view(self) -> bool:
+        """Recrear los artistas para los límites actuales de los ejes.
+
+        Devuelve False si la vista no cambió lo que se ve (mismos nodos y
+        aristas visibles), en cuyo caso no se toca ningún artista.
+        """
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        view = (x0, x1, y0, y1)
+        if view == self._view:
+            return False
+        self._view = view
+        mx, my = (x1 - x0) * CULL_MARGIN, (y1 - y0) * CULL_MARGIN
+        low, high = np.array([x0 - mx, y0 - my]), np.array([x1 + mx, y1 + my])
+
+        nodes = np.flatnonzero(((self._xy >= low) & (self._xy <= high)).all(axis=1))
+        # Una arista se conserva si su caja toca la vista (puede cruzarla sin extremos dentro)
+        edges = np.flatnonzero(((self._edge_high >= low) & (self._edge_low <= high)).all(axis=1))
+        aggregated = len(nodes) > AGGREGATE_MIN_NODES
+        shown = (aggregated, nodes, edges)
+        previous = self._shown
+        if previous is not None and not aggregated and not previous[0] \
+                and np.array_equal(previous[1], nodes) and np.array_equal(previous[2], edges):
+            return False
+        self._shown = shown
+        self.aggregated = aggregated
+        self._background = None
+
+        for artist in (self.edge_artist, self.node_artist):
+            if artist is not None:
+                artist.remove()
+        self.edge_artist = self.node_artist = None
+        if aggregated:
+            self._draw_clusters(nodes, edges, low, high)
+            self._sync_labels(())
+            self._sync_edge_labels(())
+        else:
+            self._draw_nodes(nodes, edges)
+            self._sync_labels(nodes if len(nodes) <= NODE_LABEL_MAX_NODES else ())
+            self._sync_edge_labels(edges if len(edges) <= EDGE_LABEL_MAX_EDGES else ())
+        return True
+
+    def _draw_nodes(self, nodes: "np.ndarray", edges: "np.ndarray"):
+        names, xy = self._names, self._xy
+        self.node_index = {names[i]: j for j, i in enumerate(nodes)}
+        self.node_colors = self._colors([[names[i]] for i in nodes])
+        self.edge_artist = LineCollection(xy[self._ends[edges]], colors=EDGE_COLOR, linewidths=1.0, zorder=1)
+        self.ax.add_collection(self.edge_artist, autolim=False)
+        if len(nodes):
+            size = self.node_size if len(nodes) <= NODE_LABEL_MAX_NODES else self.node_size * SMALL_NODE_SCALE
+            self.node_artist = self.ax.scatter(xy[nodes, 0], xy[nodes, 1], s=size, c=self.node_colors, zorder=2)
+
+    def _draw_clusters(self, nodes: "np.ndarray", edges: "np.ndarray", low: "np.ndarray", high: "np.ndarray"):
+        """Un marcador por celda ocupada de la cuadrícula, en el centro de sus
+        nodos y de área proporcional a cuántos tiene; las aristas se funden
+        en una por par de celdas."""
+        xy = self._xy
+        size = np.maximum((high - low) / AGGREGATE_GRID, 1e-12)
+        cells = np.clip(((xy[nodes] - low) / size).astype(np.int64), 0, AGGREGATE_GRID - 1)
+        _, inverse, counts = np.unique(cells[:, 0] * AGGREGATE_GRID + cells[:, 1],
+                                       return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+        k = len(counts)
+        centers = np.stack([np.bincount(inverse, xy[nodes, 0], k), np.bincount(inverse, xy[nodes, 1], k)],
+                           axis=1) / counts[:, None]
+
+        names = self._names
+        self.node_index = {names[i]: int(c) for i, c in zip(nodes, inverse)}
+        members: List[List[str]] = [[] for _ in range(k)]
+        for name in self.highlighted:
+            cell = self.node_index.get(name)
+            if cell is not None:
+                members[cell].append(name)
+        self.node_colors = self._colors(members)
+
+        # Grupo de cada extremo: su celda, o el propio nodo si quedó fuera de la vista
+        group = np.arange(len(xy)) + k
+        group[nodes] = inverse
+        points = np.concatenate([centers, xy])
+        ends = group[self._ends[edges]]
+        ends = np.unique(np.sort(ends[ends[:, 0] != ends[:, 1]], axis=1), axis=0)
+        self.edge_artist = LineCollection(points[ends], colors=EDGE_COLOR, linewidths=0.5, zorder=1)
+        self.ax.add_collection(self.edge_artist, autolim=False)
+        sizes = np.minimum(self.node_size * CLUSTER_NODE_SCALE * np.sqrt(counts), self.node_size)
+        self.node_artist = self.ax.scatter(centers[:, 0], centers[:, 1], s=sizes, c=self.node_colors, zorder=2)
+
+    def _colors(self, members: List[List[str]]) -> "np.ndarray":
+        """Color de cada marcador: el del primer nodo resaltado que contiene"""
+        base, highlighted = to_rgba(NODE_COLOR), self.highlighted
+        colors = []
+        for names in members:
+            marked = next((highlighted[name] for name in names if name in highlighted), None)
+            colors.append(marked or base)
+        return np.array(colors, dtype=float).reshape(-1, 4)
+
+    def _sync_labels(self, nodes: Iterable[int]):
+        """Dejar nombre solo en ``nodes``: se quitan los que salieron de la
+        vista y se crean los que entraron"""
+        wanted = {self._names[i]: i for i in nodes}
+        for name in [name for name in self.label_artists if name not in wanted]:
+            self.label_artists.pop(name).remove()
+        for name, i in wanted.items():
+            if name not in self.label_artists:
+                x, y = self._xy[i]
+                self.label_artists[name] = self.ax.text(x, y, name, ha='center', va='center',
+                                                        fontsize=self.font_size, zorder=3, clip_on=True)
+
+    def _sync_edge_labels(self, edges: Iterable[int]):
+        """Peso de cada arista de ``edges`` en su punto medio, girado según la
+        arista en pantalla; se reutilizan las etiquetas que ya existían"""
+        wanted = set(int(i) for i in edges)
+        for i in [i for i in self.edge_label_artists if i not in wanted]:
+            self.edge_label_artists.pop(i).remove()
+        new = np.array(sorted(wanted - self.edge_label_artists.keys()), dtype=np.int64)
+        if len(new):
+            segments = self._xy[self._ends[new]]
+            middle = segments.mean(axis=1)
+            screen = self.ax.transData.transform(segments.reshape(-1, 2)).reshape(-1, 2, 2)
+            delta = screen[:, 1] - screen[:, 0]
+            angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+            # Mantener el texto legible (nunca de cabeza)
+            angles = np.where(angles > 90, angles - 180, np.where(angles < -90, angles + 180, angles))
+            box = dict(boxstyle="round", ec=(1.0, 1.0, 1.0), fc=(1.0, 1.0, 1.0))
+            for i, (x, y), angle in zip(new, middle, angles):
+                self.edge_label_artists[int(i)] = self.ax.text(
+                    x, y, str(self._weights[i]), ha='center', va='center', fontsize=self.edge_font_size,
+                    rotation=0.0 if math.isnan(angle) else float(angle), rotation_mode='anchor',
+                    bbox=box, zorder=3, clip_on=True)
+
+    # ---------- Resaltado ----------
+    def set_node_color(self, node: str, color=HIGHLIGHT_COLOR):
+        self.highlighted[node] = to_rgba(color)
+        i = self.node_index.get(node)
+        if i is not None:
+            self.node_colors[i] = to_rgba(color)
+            if self.node_artist is not None:
+                self.node_artist.set_facecolor(self.node_colors)
+
+    def reset_colors(self) -> bool:
+        """Volver al color base; devuelve si había nodos resaltados"""
+        if not self.highlighted:
+            return False
+        self.highlighted = {}
+        self.node_colors[:] = to_rgba(NODE_COLOR)
+        if self.node_artist is not None:
+            self.node_artist.set_facecolor(self.node_colors)
+        return True
+
+    def stamp_nodes(self, nodes: List[str]) -> bool:
+        """Repintar en el lienzo solo la caja que ocupan ``nodes``: se repone
+        ahí el fondo guardado (aristas) y encima, recortados a la caja, los
+        marcadores y las etiquetas que la tocan, en el mismo orden que un
+        dibujo completo. Devuelve False si no había nada que pintar."""
+        index = sorted({self.node_index[node] for node in nodes if node in self.node_index})
+        if self.node_artist is None or not index:
+            return False
+        canvas = self.ax.figure.canvas
+        background = self._stamp_background()
+        renderer = canvas.get_renderer()
+        centers = self.ax.transData.transform(self.node_artist.get_offsets()[index])
+        sizes = self.node_artist.get_sizes()
+        radius = np.sqrt(sizes[index] if len(sizes) > 1 else sizes) / 2 + self.node_artist.get_linewidths().max()
+        radius = np.broadcast_to(radius * self.ax.figure.dpi / 72, (len(centers),))[:, None]
+        x0, y0 = np.floor((centers - radius).min(axis=0)) - 1
+        x1, y1 = np.ceil((centers + radius).max(axis=0)) + 1
+        area = Bbox.intersection(Bbox([[x0, y0], [x1, y1]]), self.ax.bbox)
+        if area is None:
+            return False
+        area = Bbox.from_extents(*np.round(area.extents))
+
+        # El buffer de Agg cuenta las filas desde arriba y restore_region
+        # incluye la última fila y columna; el recorte de lo que se pinta no
+        left, top = background.get_extents()[:2]
+        canvas.restore_region(background, bbox=(area.x0, renderer.height - area.y1,
+                                                area.x1 - 1, renderer.height - area.y0 - 1), xy=(left, top))
+        # El scatter completo (lo que cae fuera de la caja se descarta al
+        # recortar) rasteriza igual que en el dibujo completo
+        clip = self.node_artist.get_clip_box()
+        self.node_artist.set_clip_box(area)
+        self.ax.draw_artist(self.node_artist)
+        self.node_artist.set_clip_box(clip)
+        boxes = self._stamp_boxes
+        touching = np.flatnonzero((boxes[:, 2] >= area.x0) & (boxes[:, 0] <= area.x1)
+                                  & (boxes[:, 3] >= area.y0) & (boxes[:, 1] <= area.y1))
+        for k in touching:
+            text = self._stamp_texts[k]
+            clip = text.get_clip_box()
+            text.set_clip_box(area)
+            self.ax.draw_artist(text)
+            text.set_clip_box(clip)
+        return True
+
+    def _stamp_background(self):
+        """Los ejes dibujados sin nodos ni etiquetas. Se capturan una vez por
+        vista (y de nuevo si cambia el tamaño de la figura) con un dibujo
+        adicional, y el lienzo queda otra vez completo. También se anotan las
+        cajas de las etiquetas, que no cambian mientras no cambie la vista."""
+        canvas = self.ax.figure.canvas
+        bounds = tuple(round(value) for value in self.ax.bbox.extents)
+        if self._background is not None and self._background_bounds == bounds:
+            return self._background
+        hidden = [self.node_artist, *self.ax.texts]
+        for artist in hidden:
+            artist.set_visible(False)
+        try:
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.ax.bbox)
+            self._background_bounds = bounds
+        finally:
+            for artist in hidden:
+                artist.set_visible(True)
+        canvas.draw()
+
+        renderer = canvas.get_renderer()
+        self._stamp_texts = list(self.ax.texts)
+        boxes = []
+        for text in self._stamp_texts:
+            box = text.get_window_extent(renderer)
+            patch = text.get_bbox_patch()
+            if patch is not None:
+                box = Bbox.union([box, patch.get_window_extent(renderer)])
+            boxes.append(box.extents)
+        self._stamp_boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        return self._background
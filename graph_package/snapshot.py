@@ -0,0 +1,136 @@
+"""
+Instantánea binaria (.graphbin) de un CompactGraph, abierta con mmap
+
+Estructura (orden de bytes nativo, registrado en la cabecera):
+    cabecera | nombres (UTF-8 separados por NUL) | offsets int64 | vecinos int32 | pesos float64
+Cada bloque numérico empieza alineado a 8 bytes.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Optional, Tuple
+
+from .compact import CompactGraph
+from .config import SNAPSHOT_SUFFIX
+
+MAGIC = b"GRPHBIN2"
+# magic, orden de bytes, reservado, mtime_ns, tamaño, sha256, nodos, entradas CSR,
+# aristas (cada lazo una vez), bytes de nombres
+HEADER = struct.Struct("<8sB7xqq32sQQQQ")
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+_HASH_CHUNK = 1 << 20
+# Posición del mtime_ns dentro de la cabecera
+_MTIME = struct.Struct("<q")
+_MTIME_OFFSET = 16
+
+
+def snapshot_path(csv_path: str) -> str:
+    """Se conserva el nombre completo: a.csv y a.graphml tienen instantáneas distintas"""
+    return csv_path + SNAPSHOT_SUFFIX
+
+
+def source_signature(path: str) -> Tuple[int, int, bytes]:
+    """(mtime_ns, tamaño, sha256) del archivo fuente"""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return stat.st_mtime_ns, stat.st_size, digest.digest()
+
+
+def write_snapshot(compact: CompactGraph, path: str, source: Optional[str] = None) -> bool:
+    mtime_ns, size, sha = source_signature(source) if source else (0, 0, bytes(32))
+    names = "\0".join(compact.names).encode('utf-8')
+    header = HEADER.pack(MAGIC, _BYTEORDER, mtime_ns, size, sha,
+                         len(compact.names), len(compact.targets), compact.edge_count(), len(names))
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, 'wb') as file:
+            file.write(header)
+            file.write(names)
+            for values, typecode in ((compact.offsets, 'q'), (compact.targets, 'i'), (compact.weights, 'd')):
+                _pad(file)
+                file.write(array(typecode, values).tobytes())
+        os.replace(tmp, path)
+        return True
+    except OSError as e:
+        print(f"Error guardando instantánea: {e}")
+        return False
+
+
+def open_snapshot(path: str, source: Optional[str] = None) -> Optional[CompactGraph]:
+    """Abrir la instantánea sin copiar los arreglos; None si no existe, está
+    dañada o ``source`` cambió desde que se escribió."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < HEADER.size:
+            return None
+        magic, byteorder, mtime_ns, size, sha, n, m, _, names_len = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or byteorder != _BYTEORDER:
+            return None
+        if source is not None:
+            current = _fresh_mtime(source, mtime_ns, size, sha)
+            if current is None:
+                return None
+            if current != mtime_ns:
+                _update_mtime(path, current)
+
+        view = memoryview(buffer)
+        pos = HEADER.size
+        names = bytes(view[pos:pos + names_len]).decode('utf-8').split("\0") if n else []
+        pos += names_len
+        offsets, pos = _cast(view, pos, n + 1, 'q', 8)
+        targets, pos = _cast(view, pos, m, 'i', array('i').itemsize)
+        weights, pos = _cast(view, pos, m, 'd', 8)
+        if len(names) != n or pos > len(buffer):
+            return None
+        return CompactGraph(names, offsets, targets, weights)
+    except (OSError, ValueError, struct.error, TypeError) as e:
+        print(f"Error abriendo instantánea: {e}")
+        return None
+
+
+def _fresh_mtime(source: str, mtime_ns: int, size: int, sha: bytes) -> Optional[int]:
+    """mtime_ns actual de ``source`` si la instantánea sigue al día; None si no"""
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+        return mtime_ns
+    # Cambió la fecha o el tamaño: el contenido decide
+    if stat.st_size == size and source_signature(source)[2] == sha:
+        return stat.st_mtime_ns
+    return None
+
+
+def _update_mtime(path: str, mtime_ns: int):
+    """Registrar la nueva fecha tras comprobar el hash, para no volver a
+    calcularlo en cada arranque"""
+    try:
+        with open(path, 'r+b') as file:
+            file.seek(_MTIME_OFFSET)
+            file.write(_MTIME.pack(mtime_ns))
+    except OSError as e:
+        print(f"Error actualizando instantánea: {e}")
+
+
+def _cast(view: memoryview, pos: int, count: int, typecode: str, itemsize: int):
+    pos = (pos + 7) & ~7
+    end = pos + count * itemsize
+    if end > len(view):
+        raise ValueError("instantánea truncada")
+    return view[pos:end].cast(typecode), end
+
+
+def _pad(file):
+    remainder = file.tell() % 8
+    if remainder:
+        file.write(bytes(8 - remainder))
@@ -0,0 +1,93 @@
+"""
+Tareas en segundo plano para la interfaz (progreso y cancelación)
+"""
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from .tracing import VISIT, Tracer
+
+
+class TaskCancelled(BaseException):
+    """La tarea se canceló antes de terminar.
+
+    Hereda de BaseException (como asyncio.CancelledError) para atravesar los
+    ``except Exception`` de los cargadores que solo imprimen el error."""
+
+
+class BackgroundTask:
+    """Ejecuta ``fn(task)`` en un hilo aparte.
+
+    El hilo de trabajo solo publica su progreso y su resultado; la interfaz
+    los consulta periódicamente (``master.after``) y aplica el resultado en el
+    hilo principal, de modo que Tk y el modelo visible nunca se tocan desde
+    el trabajador. ``fn`` llama a ``task.report`` en sus puntos de control,
+    que lanza TaskCancelled si se pidió cancelar.
+    """
+
+    def __init__(self, fn: Callable[["BackgroundTask"], Any], label: str = ""):
+        self.label = label
+        self.progress: Tuple[int, int] = (0, 0)
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self._fn = fn
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "BackgroundTask":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self._fn(self)
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self._finished.set()
+
+    def report(self, done: int, total: int = 0):
+        """Publicar el avance (``total`` 0 si se desconoce) y atender la cancelación"""
+        self.progress = (done, total)
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def outcome(self) -> Any:
+        """Resultado de la tarea terminada; relanza su error o TaskCancelled.
+        Un resultado que llega después de cancelar se descarta."""
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class ProgressTracer(Tracer):
+    """Reporta a una tarea los nodos visitados por un recorrido"""
+
+    def __init__(self, task: BackgroundTask, total: int, every: int = 256):
+        self.task = task
+        self.total = total
+        self.every = every
+        self.visited = 0
+
+    def emit(self, kind: str, node: Optional[str], detail: Any = None):
+        if kind == VISIT:
+            self.visited += 1
+            if self.visited % self.every == 0:
+                self.task.report(self.visited, self.total)
@@ -0,0 +1,80 @@
+"""
+Instrumentación opcional de los recorridos (visit / enqueue / pop / finish)
+"""
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, TextIO
+
+VISIT = "visit"
+ENQUEUE = "enqueue"
+POP = "pop"
+FINISH = "finish"
+
+EVENT_KINDS = (VISIT, ENQUEUE, POP, FINISH)
+
+
+class TraceEvent(NamedTuple):
+    kind: str
+    node: Optional[str]
+    detail: Any = None
+
+
+class Tracer(ABC):
+    """Interfaz base. Los algoritmos reciben ``tracer=None`` por defecto y
+    solo llaman a ``emit`` cuando hay un tracer conectado."""
+
+    @abstractmethod
+    def emit(self, kind: str, node: Optional[str], detail: Any = None):
+        """Recibir un evento ``kind`` (VISIT, ENQUEUE, POP o FINISH) sobre ``node``"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RingBufferTracer(Tracer):
+    """Guarda los últimos ``capacity`` eventos en memoria"""
+
+    def __init__(self, capacity: int = 10000):
+        self.events: Deque[TraceEvent] = deque(maxlen=capacity)
+
+    def emit(self, kind: str, node: Optional[str], detail: Any = None):
+        self.events.append(TraceEvent(kind, node, detail))
+
+    def nodes(self, kind: str = VISIT) -> List[str]:
+        return [e.node for e in self.events if e.kind == kind]
+
+    def clear(self):
+        self.events.clear()
+
+
+class CounterTracer(Tracer):
+    """Solo cuenta eventos por tipo"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def emit(self, kind: str, node: Optional[str], detail: Any = None):
+        self.counts[kind] += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return {kind: self.counts[kind] for kind in EVENT_KINDS}
+
+
+class FileTracer(Tracer):
+    """Escribe cada evento como una línea separada por tabuladores"""
+
+    def __init__(self, path: str, buffering: int = 1 << 16):
+        self._file: TextIO = open(path, 'w', encoding='utf-8', buffering=buffering)
+
+    def emit(self, kind: str, node: Optional[str], detail: Any = None):
+        self._file.write(f"{kind}\t{'' if node is None else node}\t{'' if detail is None else detail}\n")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
@@ -0,0 +1,43 @@
+"""
+Conjuntos disjuntos (union-find) para componentes conexas
+"""
+from typing import Dict, Hashable
+
+
+class UnionFind:
+    """Unión por tamaño con compresión de caminos por mitades"""
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+        self.count = 0
+
+    def add(self, item: Hashable):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+            self.count += 1
+
+    def find(self, item: Hashable) -> Hashable:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size.pop(rb)
+        self.count -= 1
+        return True
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.parent
+
+    def __len__(self) -> int:
+        return len(self.parent)
@@ -359,23 +359,25 @@
 from __future__ import annotations
 
 import sys
-import tkinter as tk
-from graph_package import (
-    GraphApp, 
-    GUI_AVAILABLE
-)
 
 
 def main():
-    
+    if "--nogui" in sys.argv[1:]:
+        # Sin GUI no se importan tkinter ni matplotlib
+        from graph_package.cli import main as cli_main
+        sys.exit(cli_main([arg for arg in sys.argv[1:] if arg != "--nogui"]))
+
+    from graph_package import GraphApp, GUI_AVAILABLE
+
     if not GUI_AVAILABLE:
         print("[ERROR] GUI no disponible.")
         print("Instale las dependencias requeridas:")
         print("  pip install matplotlib networkx tkinter")
-        print("\nLa aplicación requiere interfaz gráfica para funcionar.")
+        print("\nSin interfaz gráfica use: python main.py --nogui --help")
         sys.exit(1)
     
     try:
+        import tkinter as tk
         root = tk.Tk()
         root.geometry("1000x700")
         app = GraphApp(root)
@@ -0,0 +1,32 @@
+"""
+Preprocesamiento fuera de línea de la jerarquía de contracción
+
+Uso:
+    python preprocess.py [edges.csv]
+
+Guarda la jerarquía junto al CSV (edges.csv.ch.json). GraphModel.load_hierarchy
+la usa mientras el grafo no cambie; si cambió, las consultas vuelven a Dijkstra.
+Se construye sobre el CSV con su bitácora aplicada, que es el grafo que
+cargan la GUI y la línea de comandos.
+"""
+import sys
+
+from graph_package import GraphModel, DEFAULT_CSV
+from graph_package.contraction import hierarchy_path
+from graph_package.journal import MutationJournal
+
+
+def main() -> int:
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV
+    model = GraphModel()
+    if not model.file_io.load_from_csv(model.manual_graph, csv_path):
+        print(f"[ERROR] No se pudo cargar {csv_path}")
+        return 1
+    MutationJournal.replay(model.manual_graph, csv_path)
+    hierarchy = model.preprocess_routes(csv_path)
+    print(f"[INFO] Jerarquía con {len(hierarchy.names)} nodos guardada en {hierarchy_path(csv_path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())